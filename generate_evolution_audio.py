@@ -2,18 +2,14 @@
 """Script to generate audio files for evolution questions."""
 import os
 from pathlib import Path
-import hashlib
-import re
 from gtts import gTTS
 
 from pokenator.language import generate_evolution_question
+from pokenator.voice import hashed_audio_path
 
 def get_audio_path(text: str, audio_dir: Path, language: str = 'fr') -> Path:
-    """Generate a deterministic filename based on the text content."""
-    text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-    prefix = re.sub(r'[^a-zA-Z0-9]', '_', text[:30].lower())
-    filename = f"{prefix}_{text_hash[:8]}.mp3"
-    return audio_dir / language / filename
+    """Path of the audio file the game plays for the given text."""
+    return hashed_audio_path(text, audio_dir / language)
 
 def generate_audio_file(text: str, audio_path: Path, language: str = 'fr') -> None:
     """Generate an audio file for the given text."""
@@ -23,8 +19,10 @@ def generate_audio_file(text: str, audio_path: Path, language: str = 'fr') -> No
     # Create directory if it doesn't exist
     audio_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Save the audio file
-    tts.save(str(audio_path))
+    # Save the audio file through one large buffer so the MP3 parts
+    # are flushed in a single write
+    with open(audio_path, 'wb', buffering=1 << 20) as f:
+        tts.write_to_fp(f)
     print(f"Saved audio to: {audio_path}")
 
 def main():
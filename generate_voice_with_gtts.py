@@ -8,13 +8,16 @@ speech synthesis in multiple languages.
 
 import sys
 import os
+import io
 import json
 import argparse
 from pathlib import Path
 from typing import List, Dict, Any, Set
 import hashlib
+import random
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent
@@ -22,7 +25,7 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 # Import Pokenator modules
-from pokenator.models import load_dataset, QuestionGenerator
+from pokenator.models import load_dataset, get_all_colors, get_all_types
 from pokenator.language import (
     generate_type_question, generate_color_question, 
     generate_height_question, generate_weight_question,
@@ -33,13 +36,40 @@ from pokenator.voice import VoiceEngine
 
 # Try to import gTTS
 try:
-    from gtts import gTTS
+    import gtts.tts
+    import requests
+    from gtts import gTTS, gTTSError
     HAS_TTS = True
     print("gTTS library found. Audio files will be generated.")
 except ImportError:
     HAS_TTS = False
     print("gTTS library not found. Install it with: pip install gtts")
 
+# Each gTTS request is a blocking HTTPS round-trip, so a small thread pool
+# keeps several in flight at once
+MAX_WORKERS = 8
+
+# How many times a rate-limited (HTTP 429) request is retried before giving up
+MAX_RETRIES = 5
+
+# Fixed game prompts that are spoken regardless of the dataset
+_STATIC_PROMPTS = frozenset({
+    # Yes/no responses
+    "Oui",
+    "Non",
+    "Je ne sais pas",
+    # Welcome messages and other game text
+    "Bienvenue dans Pokenator! Pensez à un Pokémon de la première génération, et je vais essayer de le deviner!",
+    "Répondez par 'oui' ou 'non' aux questions.",
+    "Réfléchissons...",
+    "Analysons les possibilités...",
+    "J'ai trouvé! Votre Pokémon est",
+    "Je n'ai pas réussi à deviner votre Pokémon. Essayons encore!",
+    "Voulez-vous jouer à nouveau?",
+    "Merci d'avoir joué à Pokenator!",
+    "Je ne comprends pas. Veuillez répondre par oui ou non.",
+})
+
 def extract_all_questions(dataset: List[Dict[str, Any]]) -> Set[str]:
     """Extract all possible questions from the dataset.
     
@@ -50,72 +80,84 @@ def extract_all_questions(dataset: List[Dict[str, Any]]) -> Set[str]:
         Set of all possible question strings
     """
     print("Extracting all possible questions...")
-    questions = set()
+    questions = set(_STATIC_PROMPTS)
     
-    # Create a QuestionGenerator to help with question generation
-    qg = QuestionGenerator(dataset)
-    
-    # Add type questions
-    print("Generating type questions...")
-    all_types = set()
+    # Add the final guess questions
     for pokemon in dataset:
-        all_types.update(pokemon['types'])
+        questions.add(generate_final_guess_question(pokemon['nom']))
+        # Also add the complete final guess message for each Pokémon
+        questions.add(f"J'ai trouvé! Votre Pokémon est {pokemon['nom']}!")
     
-    for type_value in all_types:
+    # Add type and color questions
+    for type_value in get_all_types(dataset):
         questions.add(generate_type_question(type_value))
-    
-    # Add color questions
-    print("Generating color questions...")
-    all_colors = set()
-    for pokemon in dataset:
-        if 'visual_primary_color' in pokemon and pokemon['visual_primary_color'] != 'unknown':
-            all_colors.add(pokemon['visual_primary_color'])
-    
-    for color in all_colors:
+    for color in get_all_colors(dataset):
         questions.add(generate_color_question(color))
     
-    # Add height questions
-    print("Generating height questions...")
-    for height in ['small', 'large']:  # Skip 'medium' as it's not used in questions
+    # Add height and weight questions, skipping 'medium' as it's not used in questions
+    for height in ['small', 'large']:
         questions.add(generate_height_question(height))
-    
-    # Add weight questions
-    print("Generating weight questions...")
-    for weight in ['light', 'heavy']:  # Skip 'medium' as it's not used in questions
+    for weight in ['light', 'heavy']:
         questions.add(generate_weight_question(weight))
     
-    # Add final guess questions for all Pokémon
-    print("Generating final guess questions...")
-    for pokemon in dataset:
-        questions.add(generate_final_guess_question(pokemon['nom']))
-        # Also add the complete final guess message for each Pokémon
-        questions.add(f"J'ai trouvé! Votre Pokémon est {pokemon['nom']}!")
-    
     # Add error message
     questions.add(generate_error_message())
     
-    # Add yes/no responses
-    questions.add("Oui")
-    questions.add("Non")
-    questions.add("Je ne sais pas")
-    
-    # Add welcome messages and other game text
-    questions.add("Bienvenue dans Pokenator! Pensez à un Pokémon de la première génération, et je vais essayer de le deviner!")
-    questions.add("Répondez par 'oui' ou 'non' aux questions.")
-    questions.add("Réfléchissons...")
-    questions.add("Analysons les possibilités...")
-    questions.add("J'ai trouvé! Votre Pokémon est")
-    questions.add("Je n'ai pas réussi à deviner votre Pokémon. Essayons encore!")
-    questions.add("Voulez-vous jouer à nouveau?")
-    questions.add("Merci d'avoir joué à Pokenator!")
-    questions.add("Je ne comprends pas. Veuillez répondre par oui ou non.")
-    
     print(f"Extracted {len(questions)} unique questions and responses")
     return questions
 
+def _write_file_atomic(path: Path, data: bytes) -> None:
+    """Write data next to path and move it into place atomically."""
+    tmp_path = path.with_name(path.name + '.part')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+class _SharedSessionRequests:
+    """Stand-in for the ``requests`` module as seen by ``gtts.tts``.
+    
+    gTTS opens and closes a new ``requests.Session`` for every audio part, which
+    costs a TCP/TLS handshake per request. This hands it one pooled session
+    instead and forwards every other attribute to the real module.
+    """
+    
+    def __init__(self, session: 'requests.Session'):
+        self._session = session
+    
+    def Session(self) -> '_SharedSessionRequests':
+        return self
+    
+    def __enter__(self) -> 'requests.Session':
+        return self._session
+    
+    def __exit__(self, *exc_info) -> bool:
+        # Keep the session (and its pooled connections) open for the next request
+        return False
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+def _install_shared_session(pool_size: int) -> None:
+    """Make gTTS reuse keep-alive connections across requests.
+    
+    Args:
+        pool_size: Number of connections kept open, one per worker thread
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    gtts.tts.requests = _SharedSessionRequests(session)
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Check whether a gTTS error was caused by an HTTP 429 response."""
+    response = getattr(error, 'rsp', None)
+    return response is not None and response.status_code == 429
+
 def generate_audio_file_with_gtts(text: str, output_path: Path, language: str = 'fr') -> bool:
     """Generate an audio file using gTTS.
     
+    Rate-limited requests are retried with exponential backoff.
+    
     Args:
         text: Text to convert to speech
         output_path: Path to save the audio file
@@ -124,25 +166,41 @@ def generate_audio_file_with_gtts(text: str, output_path: Path, language: str =
     Returns:
         True if generation was successful, False otherwise
     """
-    try:
-        # Create the gTTS object
-        tts = gTTS(text=text, lang=language, slow=False)
-        
-        # Save the audio file
-        tts.save(str(output_path))
-        return True
-    except Exception as e:
-        print(f"Error generating audio file: {e}")
-        return False
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            # Create the gTTS object
+            tts = gTTS(text=text, lang=language, slow=False)
+            
+            # Render the MP3 in memory and write it out in one go, so a request
+            # that fails halfway never leaves a truncated file behind
+            buffer = io.BytesIO()
+            tts.write_to_fp(buffer)
+            _write_file_atomic(output_path, buffer.getbuffer())
+            return True
+        except gTTSError as e:
+            if _is_rate_limited(e) and attempt < MAX_RETRIES:
+                # Jitter keeps throttled workers from retrying in lockstep
+                time.sleep(2 ** attempt + random.random())
+                continue
+            print(f"Error generating audio file: {e}")
+            return False
+        except Exception as e:
+            print(f"Error generating audio file: {e}")
+            return False
+    return False
 
-def generate_audio_files(questions: Set[str], output_dir: Path, language: str = 'fr', force: bool = False) -> None:
+def generate_audio_files(questions: Set[str], output_dir: Path, language: str = 'fr', force: bool = False,
+                         max_workers: int = MAX_WORKERS) -> None:
     """Generate audio files for all questions using gTTS.
     
+    Requests are dispatched concurrently through a thread pool.
+    
     Args:
         questions: Set of question strings to generate audio for
         output_dir: Directory to save audio files
         language: Language code (e.g., 'fr' for French)
         force: Whether to force regeneration of existing files
+        max_workers: Number of concurrent gTTS requests
     """
     if not HAS_TTS:
         print("gTTS library not available. Cannot generate audio files.")
@@ -158,7 +216,7 @@ def generate_audio_files(questions: Set[str], output_dir: Path, language: str =
     # Generate audio files
     print(f"Generating {len(questions)} audio files in {output_dir}/{language}/...")
     
-    # Create the output directory
+    # Create the output directory before dispatching so workers don't race on mkdir
     lang_dir = output_dir / language
     lang_dir.mkdir(parents=True, exist_ok=True)
     
@@ -168,6 +226,8 @@ def generate_audio_files(questions: Set[str], output_dir: Path, language: str =
     skip_count = 0
     error_count = 0
     
+    # Work out which files actually need generating
+    pending = []
     for i, question in enumerate(sorted(questions)):
         # Get the audio path
         audio_path = voice_engine._get_audio_path(question)
@@ -178,20 +238,25 @@ def generate_audio_files(questions: Set[str], output_dir: Path, language: str =
             skip_count += 1
             continue
         
-        # Generate the audio file
-        print(f"[{i+1}/{total}] Generating: {question}")
-        
-        # Create the directory if it doesn't exist
-        audio_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Generate the audio file using gTTS
-        if generate_audio_file_with_gtts(question, audio_path, language):
-            success_count += 1
-        else:
-            error_count += 1
-        
-        # Sleep briefly to avoid rate limiting
-        time.sleep(0.5)
+        pending.append((question, audio_path))
+
+    # Share one connection pool between the worker threads
+    _install_shared_session(max_workers)
+    
+    # Generate the audio files using gTTS
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(generate_audio_file_with_gtts, question, audio_path, language): question
+            for question, audio_path in pending
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            question = futures[future]
+            if future.result():
+                print(f"[{done}/{len(pending)}] Generated: {question}")
+                success_count += 1
+            else:
+                print(f"[{done}/{len(pending)}] Failed: {question}")
+                error_count += 1
     
     print(f"\nGeneration complete:")
     print(f"- Generated: {success_count}")
@@ -209,6 +274,8 @@ def main():
                         help="Language code (default: fr)")
     parser.add_argument("--force", action="store_true",
                         help="Force regeneration of existing files")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"Number of concurrent gTTS requests (default: {MAX_WORKERS})")
     args = parser.parse_args()
     
     # Load the dataset
@@ -223,7 +290,7 @@ def main():
     
     # Generate audio files
     output_dir = Path(args.output_dir)
-    generate_audio_files(questions, output_dir, args.language, args.force)
+    generate_audio_files(questions, output_dir, args.language, args.force, args.workers)
     
     return 0
 
@@ -7,9 +7,8 @@ This module provides a simple CLI for playing the Pokenator game. It handles:
 - Displaying game state and results
 """
 
-import json
-from pathlib import Path
-from pokenator.main import QuestionGenerator, get_height_category, get_weight_category, preprocess_pokemon_dataset
+from pokenator.main import QuestionGenerator, load_dataset
+from pokenator.language import YES_ANSWERS, NO_ANSWERS
 
 def main():
     """Main game loop for the Pokenator game."""
@@ -17,16 +16,14 @@ def main():
     print("Pensez à un Pokémon de la première génération, et je vais essayer de le deviner!")
     print("Répondez par 'o' (oui) ou 'n' (non) aux questions.\n")
     
-    # Load dataset with simple preprocessing
-    data_path = Path(__file__).parent / 'data' / 'pokemon_gen1_dataset_with_colors.json'
-    with open(data_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    
-    # Preprocess the dataset using the shared function
-    dataset = preprocess_pokemon_dataset(dataset, verbose=False)
+    # Load the preprocessed dataset, cached between runs
+    dataset = load_dataset()
+    if not dataset:
+        print("Erreur lors du chargement des données!")
+        return
     
     # Initialize game
-    game = QuestionGenerator(dataset)
+    game = QuestionGenerator(dataset, verbose=True)
     
     while True:
         # Get question
@@ -38,9 +35,10 @@ def main():
         question, (attribute, value) = result
         
         # Display game state
-        print(f"\nIl reste {len(game.current_pokemon_set)} Pokémon possibles...")
-        if len(game.current_pokemon_set) <= 5:  # Show remaining Pokemon if 5 or fewer
-            print(f"Il reste: {', '.join(p['nom'] for p in game.current_pokemon_set)}")
+        remaining = game.get_remaining_count()
+        print(f"\nIl reste {remaining} Pokémon possibles...")
+        if remaining <= 5:  # Show remaining Pokemon if 5 or fewer
+            print(f"Il reste: {', '.join(game.get_possible_pokemon())}")
         print(f"\n{question}")
         
         # Handle special question types
@@ -49,7 +47,7 @@ def main():
             break
         elif attribute == 'final_guess':
             answer = input("(o/n) > ").lower().strip()
-            if answer in ['o', 'oui', 'y', 'yes']:
+            if answer in YES_ANSWERS:
                 print("\n🎉 Super! J'ai trouvé! 🎉")
             else:
                 print("\nAh, je me suis trompé! 😢")
@@ -58,10 +56,10 @@ def main():
         # Handle normal questions
         while True:
             answer = input("(o/n) > ").lower().strip()
-            if answer in ['o', 'oui', 'y', 'yes']:
+            if answer in YES_ANSWERS:
                 game.update_pokemon_set(attribute, value, True)
                 break
-            elif answer in ['n', 'non', 'no']:
+            elif answer in NO_ANSWERS:
                 game.update_pokemon_set(attribute, value, False)
                 break
             else:
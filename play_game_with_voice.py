@@ -5,49 +5,76 @@ This module provides a CLI for playing the Pokenator game with voice output.
 It extends the original play_game.py with voice functionality.
 """
 
+import io
 import json
 import sys
 import time
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add the project root to the Python path if needed
 project_root = Path(__file__).parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
+from pokenator.language import YES_ANSWERS, NO_ANSWERS
 from pokenator.models import QuestionGenerator, load_dataset
-from pokenator.voice import enable_voice, disable_voice, speak, is_voice_enabled, VoiceEngine
+from pokenator.voice import (
+    enable_voice, disable_voice, speak, is_voice_enabled, VoiceEngine, PYGAME_AVAILABLE,
+    PLAYBACK_POLL_MS
+)
 
-def main():
-    """Main game loop for the Pokenator game with voice support."""
-    # Enable voice output
-    enable_voice()
-    
-    # Create a voice engine to help with filename generation
-    audio_dir = Path("audio")
-    language = "fr"
-    voice_engine = VoiceEngine(enabled=True, language=language, audio_dir=audio_dir)
+# gTTS is optional; it is only used for names without a pre-generated audio file
+try:
+    from gtts import gTTS
+    HAS_TTS = True
+except ImportError:
+    HAS_TTS = False
+
+def wait_for_playback() -> None:
+    """Block until the current music track has finished playing."""
+    import pygame
+    while pygame.mixer.music.get_busy():
+        pygame.time.wait(PLAYBACK_POLL_MS)
+
+def speak_live(text: str, language: str) -> bool:
+    """Synthesize text with gTTS and play it straight from memory.
     
-    # Welcome message
-    welcome_msg = "Bienvenue dans Pokenator! Pensez à un Pokémon de la première génération, et je vais essayer de le deviner!"
-    print("\n🎮 " + welcome_msg + " 🎮")
-    speak(welcome_msg)
+    Args:
+        text: Text to convert to speech
+        language: Language code (e.g., 'fr' for French)
+        
+    Returns:
+        True if the audio was played, False otherwise
+    """
+    if not (HAS_TTS and PYGAME_AVAILABLE):
+        return False
     
-    instructions = "Répondez par 'o' (oui) ou 'n' (non) aux questions."
-    print(instructions + "\n")
-    speak("Répondez par 'oui' ou 'non' aux questions.")
+    import pygame
+    try:
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language, slow=False).write_to_fp(buffer)
+        buffer.seek(0)
+        pygame.mixer.music.load(buffer, 'mp3')
+        pygame.mixer.music.play()
+        wait_for_playback()
+        return True
+    except Exception as e:
+        print(f"[VOICE] Error streaming audio: {e}")
+        return False
+
+def play_one_round(dataset: List[Dict[str, Any]], voice_engine: VoiceEngine) -> None:
+    """Play a single game until the final guess or an error.
     
-    # Load dataset
-    print("Chargement des données...")
-    dataset = load_dataset()
-    if not dataset:
-        error_msg = "Erreur lors du chargement des données!"
-        print(error_msg)
-        speak(error_msg)
-        return
+    Args:
+        dataset: Preprocessed Pokémon dataset
+        voice_engine: Voice engine providing the audio directory and language
+    """
+    audio_dir = voice_engine.audio_dir
+    language = voice_engine.language
     
     # Create question generator
-    qg = QuestionGenerator(dataset)
+    qg = QuestionGenerator(dataset, verbose=True)
     
     # Main game loop
     while True:
@@ -77,16 +104,14 @@ def main():
                 # Use the custom audio file directly
                 import pygame
                 try:
-                    pygame.mixer.init()
                     pygame.mixer.music.load(str(pokemon_audio_path))
                     pygame.mixer.music.play()
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
+                    wait_for_playback()
                 except Exception as e:
                     print(f"[VOICE] Error playing Pokémon name audio: {e}")
                     # Fall back to text output
                     print(f"[VOICE] Text: {value}")
-            else:
+            elif not speak_live(value, language):
                 # Fall back to regular speak function
                 speak(value)
             break
@@ -107,11 +132,11 @@ def main():
         # Get user input
         while True:
             user_input = input("(o/n) > ").strip().lower()
-            if user_input in ['o', 'oui', 'y', 'yes']:
+            if user_input in YES_ANSWERS:
                 answer = True
                 speak("Oui")
                 break
-            elif user_input in ['n', 'non', 'no']:
+            elif user_input in NO_ANSWERS:
                 answer = False
                 speak("Non")
                 break
@@ -122,19 +147,68 @@ def main():
         
         # Update the Pokémon set based on the answer
         qg.update_pokemon_set(attribute, value, answer)
-    
-    # Ask if the user wants to play again
+
+def _ask_replay() -> bool:
+    """Ask whether the user wants to play another round."""
     print("\nVoulez-vous jouer à nouveau? (o/n)")
     # Just use text output for this message
     print("Voulez-vous jouer à nouveau?")
     
     user_input = input("> ").strip().lower()
-    if user_input in ['o', 'oui', 'y', 'yes']:
-        main()  # Restart the game
-    else:
-        print("Merci d'avoir joué à Pokenator!")
-        # Just use text output for this message
-        print("Merci d'avoir joué à Pokenator!")
+    return user_input in YES_ANSWERS
+
+def setup() -> Optional[Tuple[List[Dict[str, Any]], VoiceEngine]]:
+    """Prepare everything shared between rounds: voice, mixer and dataset.
+    
+    Returns:
+        Tuple of (dataset, voice_engine), or None if the dataset failed to load
+    """
+    # Enable voice output
+    enable_voice()
+    
+    # Create a voice engine to help with filename generation; it also opens
+    # the mixer used for the streamed and name audio
+    audio_dir = Path("audio")
+    language = "fr"
+    voice_engine = VoiceEngine(enabled=True, language=language, audio_dir=audio_dir)
+    voice_engine.ensure_mixer()
+    
+    # Welcome message
+    welcome_msg = "Bienvenue dans Pokenator! Pensez à un Pokémon de la première génération, et je vais essayer de le deviner!"
+    print("\n🎮 " + welcome_msg + " 🎮")
+    speak(welcome_msg)
+    
+    instructions = "Répondez par 'o' (oui) ou 'n' (non) aux questions."
+    print(instructions + "\n")
+    speak("Répondez par 'oui' ou 'non' aux questions.")
+    
+    # Load dataset
+    print("Chargement des données...")
+    dataset = load_dataset()
+    if not dataset:
+        error_msg = "Erreur lors du chargement des données!"
+        print(error_msg)
+        speak(error_msg)
+        return None
+    
+    return dataset, voice_engine
+
+def main():
+    """Main game loop for the Pokenator game with voice support."""
+    state = setup()
+    if state is None:
+        return
+    dataset, voice_engine = state
+    
+    # Replay in a loop so the dataset, voice engine and mixer are set up only once
+    while True:
+        play_one_round(dataset, voice_engine)
+        if not _ask_replay():
+            break
+    
+    print("Merci d'avoir joué à Pokenator!")
+    # Just use text output for this message
+    print("Merci d'avoir joué à Pokenator!")
 
 if __name__ == '__main__':
     main()
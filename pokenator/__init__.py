@@ -1,9 +1,29 @@
-"""Pokenator package initialization."""
+"""Pokenator package initialization.
 
-# Import main modules to make them available when importing the package
-from . import models
-from . import language
-from . import main
+Submodules and the symbols re-exported by ``pokenator.main`` are loaded lazily
+on first attribute access, so importing one submodule doesn't pull in the rest.
+"""
+import importlib
 
-# Re-export the main symbols for backward compatibility
-from .main import *
+_SUBMODULES = frozenset(('cache', 'jsonio', 'models', 'language', 'main', 'voice'))
+
+# Re-exported from .main for backward compatibility
+__all__ = [
+    'QuestionGenerator', 'load_dataset', 'get_height_category', 'get_weight_category',
+    'can_evolve', 'preprocess_pokemon_dataset', 'get_type_combinations', 'get_type_groups',
+    'normalize_letter', 'get_first_letter', 'HEIGHT_BRACKETS', 'WEIGHT_BRACKETS',
+    'COLOR_TRANSLATIONS', 'HEIGHT_TRANSLATIONS', 'WEIGHT_TRANSLATIONS',
+    'ATTRIBUTE_TRANSLATIONS', 'DATA_DIR'
+]
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in __all__:
+        value = getattr(importlib.import_module('.main', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(__all__))
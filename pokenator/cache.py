@@ -0,0 +1,33 @@
+"""On-disk caching helpers for the Pokenator game.
+
+This module holds the pieces shared by the caches that sit next to the data
+files, such as the preprocessed dataset and the parsed voice mapping.
+"""
+import contextlib
+import pickle
+from pathlib import Path
+from typing import Any
+
+def save_pickle_atomic(path: Path, obj: Any) -> None:
+    """Pickle an object to a file, replacing it atomically.
+
+    The object is written to a temporary file next to the target first, so a
+    concurrent reader never sees half a pickle. The temporary file is removed
+    if writing fails.
+
+    Args:
+        path: File to write
+        obj: Object to pickle
+
+    Raises:
+        OSError: If the file couldn't be written, e.g. in a read-only directory
+    """
+    tmp_path = path.with_suffix('.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,32 @@
+"""JSON parsing for the Pokenator game.
+
+The dataset is parsed by the game, the command-line interfaces and the web
+interface; they all go through this module so that they share one parser.
+"""
+import json
+from typing import Any, Union
+
+# orjson is optional; it parses the dataset faster than the stdlib json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def parse_json(data: Union[bytes, memoryview]) -> Any:
+    """Parse a JSON document from its raw bytes.
+
+    Args:
+        data: UTF-8 encoded JSON, e.g. the contents of a file opened in binary mode
+
+    Returns:
+        The parsed document
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid; orjson.JSONDecodeError
+                              subclasses it, so callers handle both the same way
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    # The stdlib parser needs real bytes rather than a memoryview
+    return json.loads(bytes(data))
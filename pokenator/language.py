@@ -3,35 +3,49 @@
 This module handles text generation, translations, and language-specific content.
 It provides functions for generating questions and formatting text in different languages.
 """
-import unicodedata
 import os
 import csv
+import functools
 from typing import Dict, Any
 
+LOCALS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'locals.csv')
+
+@functools.cache
+def _load(language: str) -> Dict[str, str]:
+    """Load translations for a language from the CSV file.
+    
+    The file is only parsed once per language; every LocalizationManager
+    for that language shares the resulting dictionary.
+    """
+    translations = {}
+    with open(LOCALS_PATH, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            translations[row['key']] = row[language]
+    return translations
+
 class LocalizationManager:
     def __init__(self, language: str = 'fr'):
         self.language = language
-        self.translations: Dict[str, str] = {}
-        self._load_translations()
-    
-    def _load_translations(self):
-        """Load translations from the CSV file."""
-        csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'locals.csv')
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.translations[row['key']] = row[self.language]
+        self.translations: Dict[str, str] = _load(language)
     
     def get_text(self, key: str, **kwargs) -> str:
         """Get translated text with optional format arguments."""
         text = self.translations.get(key, key)
-        if kwargs:
-            return text.format(**kwargs)
-        return text
+        return text.format_map(kwargs) if kwargs else text
 
 # Global instance
 localization = LocalizationManager()
 
+# Texts without format arguments, resolved once
+_EVOLUTION_CAN_TEXT = localization.get_text('evolution_can')
+_EVOLUTION_FINAL_TEXT = localization.get_text('evolution_final')
+_ERROR_TEXT = localization.get_text('error_understanding')
+
+# Accepted answers to yes/no questions, shared by the command-line interfaces
+YES_ANSWERS = frozenset(('o', 'oui', 'y', 'yes'))
+NO_ANSWERS = frozenset(('n', 'non', 'no'))
+
 # Size classification brackets based on statistical analysis
 HEIGHT_BRACKETS = {
     'small': 0.70,  # ≤ 0.70m
@@ -45,6 +59,12 @@ WEIGHT_BRACKETS = {
     # heavy: > 56.25kg
 }
 
+# Accented letters found in French Pokémon names, folded to their ASCII base
+_ACCENT_FOLD = str.maketrans(
+    "àáâäãåÀÁÂÄÃÅéèêëÉÈÊËíìîïÍÌÎÏóòôöõÓÒÔÖÕúùûüÚÙÛÜçÇñÑ",
+    "aaaaaaAAAAAAeeeeEEEEiiiiIIIIoooooOOOOOuuuuUUUUcCnN",
+)
+
 def normalize_letter(letter: str) -> str:
     """Normalize a letter by removing accents and converting to lowercase.
     
@@ -56,32 +76,88 @@ def normalize_letter(letter: str) -> str:
     Returns:
         Normalized character in lowercase
     """
-    return unicodedata.normalize('NFKD', letter).encode('ASCII', 'ignore').decode().lower()
+    folded = letter.translate(_ACCENT_FOLD).lower()
+    if folded.isascii():
+        return folded
+    # Not covered by the table (e.g. ÿ): fall back to a full decomposition,
+    # only needed for such names, so not imported at module load
+    import unicodedata
+    return unicodedata.normalize('NFKD', folded).encode('ASCII', 'ignore').decode()
 
 def get_first_letter(name: str) -> str:
     """Get the normalized first letter of a name"""
     return normalize_letter(name[0])
 
+# French names for the primary colors extracted from the official artwork
+COLOR_TRANSLATIONS = {
+    'black': 'noir',
+    'blue': 'bleu',
+    'brown': 'marron',
+    'gray': 'gris',
+    'green': 'vert',
+    'pink': 'rose',
+    'purple': 'violet',
+    'red': 'rouge',
+    'white': 'blanc',
+    'yellow': 'jaune',
+}
+
+HEIGHT_TRANSLATIONS = {
+    'small': 'petit',
+    'medium': 'moyen',
+    'large': 'grand',
+}
+
+WEIGHT_TRANSLATIONS = {
+    'light': 'léger',
+    'medium': 'moyen',
+    'heavy': 'lourd',
+}
+
+ATTRIBUTE_TRANSLATIONS = {
+    'type': 'type',
+    'primary_color': 'couleur',
+    'height_category': 'taille',
+    'weight_category': 'poids',
+    'can_evolve': 'évolution',
+}
+
+# Pokémon types as they appear in the dataset
+_POKEMON_TYPES = (
+    'Acier', 'Combat', 'Dragon', 'Eau', 'Feu', 'Fée', 'Glace', 'Insecte', 'Normal',
+    'Plante', 'Poison', 'Psy', 'Roche', 'Sol', 'Spectre', 'Vol', 'Électrik',
+)
+
+# Questions for every known attribute value, formatted once at import
+_TYPE_QUESTIONS = {t: localization.get_text('type_question', type=t) for t in _POKEMON_TYPES}
+_COLOR_QUESTIONS = {
+    color: localization.get_text('color_question', color=french)
+    for color, french in COLOR_TRANSLATIONS.items()
+}
+_HEIGHT_QUESTIONS = {h: localization.get_text(f'height_{h}') for h in HEIGHT_TRANSLATIONS}
+_WEIGHT_QUESTIONS = {w: localization.get_text(f'weight_{w}') for w in WEIGHT_TRANSLATIONS}
+
 def generate_type_question(type_value: str) -> str:
     """Generate a question about a Pokémon's type in French."""
-    return localization.get_text('type_question', type=type_value)
+    return (_TYPE_QUESTIONS.get(type_value)
+            or localization.get_text('type_question', type=type_value))
 
 def generate_color_question(color_value: str) -> str:
     """Generate a question about a Pokémon's primary color in French."""
-    return localization.get_text('color_question', color=color_value)
+    return (_COLOR_QUESTIONS.get(color_value)
+            or localization.get_text('color_question', color=COLOR_TRANSLATIONS.get(color_value, color_value)))
 
 def generate_height_question(height_value: str) -> str:
     """Generate a question about a Pokémon's height category in French."""
-    return localization.get_text(f'height_{height_value}')
+    return _HEIGHT_QUESTIONS.get(height_value) or localization.get_text(f'height_{height_value}')
 
 def generate_weight_question(weight_value: str) -> str:
     """Generate a question about a Pokémon's weight category in French."""
-    return localization.get_text(f'weight_{weight_value}')
+    return _WEIGHT_QUESTIONS.get(weight_value) or localization.get_text(f'weight_{weight_value}')
 
 def generate_evolution_question(can_evolve: bool) -> str:
     """Generate a question about a Pokémon's evolution capability in French."""
-    key = 'evolution_can' if can_evolve else 'evolution_final'
-    return localization.get_text(key)
+    return _EVOLUTION_CAN_TEXT if can_evolve else _EVOLUTION_FINAL_TEXT
 
 def generate_final_guess_question(pokemon_name: str) -> str:
     """Generate a final guess question in French."""
@@ -89,7 +165,7 @@ def generate_final_guess_question(pokemon_name: str) -> str:
 
 def generate_error_message() -> str:
     """Generate an error message in French when no Pokémon matches the criteria."""
-    return localization.get_text('error_understanding')
+    return _ERROR_TEXT
 
 def generate_question(attribute: str, value: Any) -> str:
     """Generate a question based on the attribute and value.
@@ -4,12 +4,7 @@ This file now serves as a compatibility layer to maintain backward compatibility
 while using the new modular structure. It re-exports all the symbols from the
 models and language modules.
 """
-import json
 from pathlib import Path
-from typing import List, Dict, Any, Set, Tuple, Union
-from collections import Counter, defaultdict
-import unicodedata
-import traceback
 
 # Import everything from the new modules
 from .models import (
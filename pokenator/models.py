@@ -3,12 +3,24 @@
 This module contains the core data models and game logic for the Pokenator game.
 It handles data loading, preprocessing, and the main game state management.
 """
+import bisect
+import functools
+import hashlib
+import heapq
 import json
+import logging
+import math
+import mmap
+import pickle
+import sys
 from pathlib import Path
-from typing import List, Dict, Any, Set, Tuple, Union
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 from collections import Counter, defaultdict
-import traceback
+from itertools import chain
+from operator import itemgetter
 
+from .cache import save_pickle_atomic
+from .jsonio import parse_json
 from .language import (
     normalize_letter, get_first_letter, HEIGHT_BRACKETS, WEIGHT_BRACKETS,
     generate_question, generate_final_guess_question, generate_error_message,
@@ -16,24 +28,67 @@ from .language import (
 )
 
 DATA_DIR = Path(__file__).parent.parent / 'data'
+_DATASET_PATH = DATA_DIR / "pokemon_gen1_dataset_with_colors.json"
+
+# Bump whenever preprocess_pokemon_dataset changes what it stores, so that
+# cached datasets from older versions are not reused
+_CACHE_VERSION = 4
+
+logger = logging.getLogger(__name__)
+
+# Keys of the per-Pokémon dicts read and written by the hot paths, interned
+# once so that every lookup can match them by identity
+_K_NAME = sys.intern('nom')
+_K_TYPES = sys.intern('types')
+_K_COLOR = sys.intern('visual_primary_color')
+_K_HEIGHT = sys.intern('height_category')
+_K_WEIGHT = sys.intern('weight_category')
+_K_CAN_EVOLVE = sys.intern('can_evolve')
+_K_TYPES_SET = sys.intern('_types_set')
+_K_TYPES_KEY = sys.intern('_types_key')
+_K_FIRST_LETTER = sys.intern('_first_letter')
+
+# Attributes that questions can be asked about, in evaluation order
+_QUESTION_ATTRIBUTES = ('type', 'primary_color', 'height_category', 'weight_category', 'can_evolve')
+
+# Attributes with a handful of string values, stored as one-byte codes per Pokémon
+_CODED_ATTRIBUTES = ('primary_color', 'height_category', 'weight_category')
+
+# Question attribute stored in the column store for each per-Pokémon field
+_COLUMN_KEYS = {
+    _K_COLOR: 'primary_color',
+    _K_HEIGHT: 'height_category',
+    _K_WEIGHT: 'weight_category',
+    _K_CAN_EVOLVE: 'can_evolve',
+}
+
+# Medium/average height and weight categories are never asked about. "Can it
+# evolve?" splits the Pokémon exactly like "is it a final form?" and would win
+# the tie, so only the final form question, which has pre-generated audio, is asked
+_SKIPPED_QUESTIONS = frozenset({
+    ('height_category', 'medium'), ('weight_category', 'medium'), ('can_evolve', True),
+})
+
+# French names of the attribute values, for debug output
+_FRENCH_VALUES = {
+    'primary_color': COLOR_TRANSLATIONS,
+    'height_category': HEIGHT_TRANSLATIONS,
+    'weight_category': WEIGHT_TRANSLATIONS,
+}
+
+# Sorted bracket upper bounds and the category for each interval, for bisect lookups
+_HEIGHT_THRESHOLDS = (HEIGHT_BRACKETS['small'], HEIGHT_BRACKETS['medium'])
+_HEIGHT_LABELS = ('small', 'medium', 'large')
+_WEIGHT_THRESHOLDS = (WEIGHT_BRACKETS['light'], WEIGHT_BRACKETS['medium'])
+_WEIGHT_LABELS = ('light', 'medium', 'heavy')
 
 def get_height_category(height: float) -> str:
     """Categorize a Pokémon's height."""
-    if height <= HEIGHT_BRACKETS['small']:
-        return 'small'
-    elif height <= HEIGHT_BRACKETS['medium']:
-        return 'medium'
-    else:
-        return 'large'
+    return _HEIGHT_LABELS[bisect.bisect_left(_HEIGHT_THRESHOLDS, height)]
 
 def get_weight_category(weight: float) -> str:
     """Classify a Pokemon's weight into light, medium, or heavy"""
-    if weight <= WEIGHT_BRACKETS['light']:
-        return 'light'
-    elif weight <= WEIGHT_BRACKETS['medium']:
-        return 'medium'
-    else:
-        return 'heavy'
+    return _WEIGHT_LABELS[bisect.bisect_left(_WEIGHT_THRESHOLDS, weight)]
 
 def can_evolve(evolution: List[Any], id: int) -> bool:
     """Check if a Pokemon can evolve based on its evolution chain"""
@@ -44,14 +99,36 @@ def can_evolve(evolution: List[Any], id: int) -> bool:
     try:
         position = evolution.index(id)
         # If it's not the last in the chain, it can evolve
-        can_evolve = position < len(evolution) - 1
-        print(f"[DEBUG] ID {id} is at position {position} in chain {evolution}, can_evolve={can_evolve}")
-        return can_evolve
+        return position < len(evolution) - 1
     except ValueError:
         # ID not found in evolution chain
-        print(f"[DEBUG] ID {id} not found in evolution chain {evolution}")
         return False
 
+def _assign_categories(dataset: List[Dict[str, Any]], field: str, key: str,
+                       thresholds: Tuple[float, ...], labels: Tuple[str, ...]) -> int:
+    """Bucket a numeric field of every Pokémon into a category.
+    
+    Args:
+        dataset: List of Pokémon to update in place
+        field: Name of the numeric field to read (e.g. 'taille')
+        key: Name of the category field to write (e.g. 'height_category')
+        thresholds: Sorted upper bounds of every category but the last
+        labels: Category names, one more than there are thresholds
+        
+    Returns:
+        Number of Pokémon with a usable value; the rest are set to 'unknown'
+    """
+    bisect_left = bisect.bisect_left
+    count = 0
+    for pokemon in dataset:
+        value = pokemon.get(field)
+        if isinstance(value, (int, float)):
+            pokemon[key] = labels[bisect_left(thresholds, value)]
+            count += 1
+        else:
+            pokemon[key] = 'unknown'
+    return count
+
 def preprocess_pokemon_dataset(dataset: List[Dict[str, Any]], verbose: bool = False) -> List[Dict[str, Any]]:
     """Preprocess the Pokémon dataset by adding derived attributes.
     
@@ -63,14 +140,11 @@ def preprocess_pokemon_dataset(dataset: List[Dict[str, Any]], verbose: bool = Fa
         The processed dataset with added attributes
     """
     visual_color_count = 0
-    missing_color_count = 0
-    height_count = 0
-    missing_height_count = 0
     
     # Debug: Print first 3 Pokémon before preprocessing if verbose
     if verbose:
         for i, pokemon in enumerate(dataset[:3]):
-            print(f"[DEBUG] Pokemon {i+1}: {pokemon['nom']}")
+            print(f"[DEBUG] Pokemon {i+1}: {pokemon[_K_NAME]}")
             print(f"[DEBUG] Raw data:")
             print(f"  - taille: {pokemon.get('taille', 'missing')}")
             
@@ -80,52 +154,32 @@ def preprocess_pokemon_dataset(dataset: List[Dict[str, Any]], verbose: bool = Fa
                     print(f"  - primary_color: {pokemon['visual_attributes']['primary_color']}")
     
     for pokemon in dataset:
-        # Add visual_primary_color
-        if ('visual_attributes' in pokemon and 
-            isinstance(pokemon['visual_attributes'], dict) and 
-            'primary_color' in pokemon['visual_attributes'] and
-            pokemon['visual_attributes']['primary_color']):
-            
-            color = pokemon['visual_attributes']['primary_color']
-            if isinstance(color, str):
-                pokemon['visual_primary_color'] = color.lower()
-                visual_color_count += 1
-            else:
-                pokemon['visual_primary_color'] = 'unknown'
-                missing_color_count += 1
+        # Add visual_primary_color, looking each level up only once
+        visual_attributes = pokemon.get('visual_attributes')
+        color = visual_attributes.get('primary_color') if isinstance(visual_attributes, dict) else None
+        if color and isinstance(color, str):
+            pokemon[_K_COLOR] = color.lower()
+            visual_color_count += 1
         else:
-            pokemon['visual_primary_color'] = 'unknown'
-            missing_color_count += 1
-        
-        # Add height category
-        if 'taille' in pokemon and pokemon['taille'] is not None:
-            height = pokemon['taille']
-            if isinstance(height, (int, float)):
-                pokemon['height_category'] = get_height_category(height)
-                height_count += 1
-            else:
-                pokemon['height_category'] = 'unknown'
-                missing_height_count += 1
-        else:
-            pokemon['height_category'] = 'unknown'
-            missing_height_count += 1
-        
-        # Add weight category
-        if 'poids' in pokemon and pokemon['poids'] is not None:
-            weight = pokemon['poids']
-            if isinstance(weight, (int, float)):
-                pokemon['weight_category'] = get_weight_category(weight)
-            else:
-                pokemon['weight_category'] = 'unknown'
-        else:
-            pokemon['weight_category'] = 'unknown'
-            
-        # Add evolution capability
-        if 'evolution' in pokemon:
-            print(f"[DEBUG] Processing evolution for {pokemon['nom']} (ID: {pokemon['id']})")
-            print(f"[DEBUG] Evolution chain: {pokemon['evolution']}")
-            pokemon['can_evolve'] = can_evolve(pokemon['evolution'], pokemon['id'])
-            print(f"[DEBUG] {pokemon['nom']} can_evolve = {pokemon['can_evolve']}")
+            pokemon[_K_COLOR] = 'unknown'
+        
+        # Add a set of the types for O(1) membership tests
+        pokemon[_K_TYPES_SET] = frozenset(pokemon[_K_TYPES])
+        
+        # Add the sorted type combination, for grouping by combination
+        pokemon[_K_TYPES_KEY] = tuple(sorted(pokemon[_K_TYPES]))
+        
+        # Add the normalized first letter of the name
+        pokemon[_K_FIRST_LETTER] = normalize_letter(pokemon[_K_NAME][0]) if pokemon.get(_K_NAME) else ''
+        
+        # Add evolution capability, set for every Pokémon so that it can be read without .get()
+        pokemon[_K_CAN_EVOLVE] = can_evolve(pokemon.get('evolution'), pokemon.get('id'))
+    
+    # Bucket the numeric columns in one pass each
+    height_count = _assign_categories(dataset, 'taille', _K_HEIGHT, _HEIGHT_THRESHOLDS, _HEIGHT_LABELS)
+    missing_height_count = len(dataset) - height_count
+    missing_color_count = len(dataset) - visual_color_count
+    _assign_categories(dataset, 'poids', _K_WEIGHT, _WEIGHT_THRESHOLDS, _WEIGHT_LABELS)
     
     if verbose:
         print(f"[DEBUG] Preprocessing stats:")
@@ -135,16 +189,16 @@ def preprocess_pokemon_dataset(dataset: List[Dict[str, Any]], verbose: bool = Fa
         print(f"  - Pokémon missing height: {missing_height_count}/{len(dataset)} ({missing_height_count/len(dataset)*100:.1f}%)")
         
         # Count evolution capability
-        can_evolve_count = sum(1 for p in dataset if p.get('can_evolve', False))
+        can_evolve_count = sum(1 for p in dataset if p[_K_CAN_EVOLVE])
         print(f"  - Pokémon that can evolve: {can_evolve_count}/{len(dataset)} ({can_evolve_count/len(dataset)*100:.1f}%)")
         print(f"  - Pokémon that cannot evolve: {len(dataset) - can_evolve_count}/{len(dataset)} ({(len(dataset) - can_evolve_count)/len(dataset)*100:.1f}%)")
         
         # Debug: Print first 3 Pokémon after preprocessing
         for i, pokemon in enumerate(dataset[:3]):
-            print(f"[DEBUG] Pokemon {i+1} after preprocessing: {pokemon['nom']}")
-            print(f"  - visual_primary_color: {pokemon.get('visual_primary_color', 'missing')}")
-            print(f"  - height_category: {pokemon.get('height_category', 'missing')}")
-            print(f"  - can_evolve: {pokemon.get('can_evolve', 'missing')}")
+            print(f"[DEBUG] Pokemon {i+1} after preprocessing: {pokemon[_K_NAME]}")
+            print(f"  - visual_primary_color: {pokemon.get(_K_COLOR, 'missing')}")
+            print(f"  - height_category: {pokemon.get(_K_HEIGHT, 'missing')}")
+            print(f"  - can_evolve: {pokemon.get(_K_CAN_EVOLVE, 'missing')}")
     
     return dataset
 
@@ -152,7 +206,7 @@ def get_type_combinations(pokemon_set: List[Dict[str, Any]]) -> Dict[Tuple[str,
     """Get all type combinations present in the dataset with their Pokemon"""
     combinations = defaultdict(list)
     for pokemon in pokemon_set:
-        type_combo = tuple(sorted(pokemon['types']))
+        type_combo = pokemon.get(_K_TYPES_KEY) or tuple(sorted(pokemon[_K_TYPES]))
         combinations[type_combo].append(pokemon)
     return combinations
 
@@ -160,34 +214,126 @@ def get_type_groups(pokemon_set: List[Dict[str, Any]]) -> Dict[str, List[Dict[st
     """Group Pokemon by their types (single or part of dual-type)"""
     groups = defaultdict(list)
     for pokemon in pokemon_set:
-        for type_ in pokemon['types']:
+        for type_ in pokemon[_K_TYPES]:
             groups[type_].append(pokemon)
     return groups
 
-def load_dataset() -> List[Dict[str, Any]]:
-    """Load Pokémon dataset from JSON file and preprocess it."""
+def get_all_types(pokemon_set: List[Dict[str, Any]]) -> Set[str]:
+    """Get every type present in the given set of Pokemon"""
+    return set().union(*(pokemon[_K_TYPES] for pokemon in pokemon_set))
+
+def get_all_colors(pokemon_set: List[Dict[str, Any]]) -> Set[str]:
+    """Get every known primary color present in the given set of Pokemon"""
+    return {color for pokemon in pokemon_set
+            if (color := pokemon.get(_K_COLOR)) and color != 'unknown'}
+
+def _intern_keys(dataset: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rebuild every entry with interned keys.
+    
+    Parsed and unpickled keys are equal to the _K_* constants but not the same
+    objects; interning them lets the lookups take the identity fast path.
+    """
+    intern = sys.intern
+    return [{intern(key): value for key, value in pokemon.items()} for pokemon in dataset]
+
+def _load_cached_dataset(cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Load a preprocessed dataset pickled by _save_cached_dataset, if there is one."""
     try:
-        data_path = DATA_DIR / "pokemon_gen1_dataset_with_colors.json"
-        print(f"Loading dataset from: {data_path} (exists: {data_path.exists()})")
-        
-        with open(data_path, 'r', encoding='utf-8') as f:
-            raw_data = f.read()
-            print(f"Read {len(raw_data)} bytes from file")
-            
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A corrupt or incompatible cache is rebuilt from the JSON file
+        logger.debug("Ignoring unreadable dataset cache %s: %s", cache_path, e)
+        return None
+
+def _save_cached_dataset(cache_path: Path, dataset: List[Dict[str, Any]]) -> None:
+    """Pickle a preprocessed dataset, replacing the caches of older inputs."""
+    try:
+        save_pickle_atomic(cache_path, dataset)
+    except OSError as e:
+        # Caching is only an optimization, e.g. the data directory may be read-only
+        logger.debug("Could not write dataset cache %s: %s", cache_path, e)
+        return
+    
+    # Only once the new cache is in place are the caches of older inputs removed
+    for stale in cache_path.parent.glob('.cache_*.pkl'):
+        if stale != cache_path:
             try:
-                dataset = json.loads(raw_data)
-                print(f"Successfully parsed JSON, loaded {len(dataset)} Pokémon")
-            except json.JSONDecodeError as e:
-                print(f"JSON parsing error: {e}")
-                return []
-                
+                stale.unlink()
+            except OSError:
+                pass
+
+@functools.lru_cache(maxsize=1)
+def _read_dataset(data_path: Path, mtime_ns: int, size: int) -> List[Dict[str, Any]]:
+    """Parse and preprocess the dataset file once per version of the file.
+    
+    The modification time and size are only part of the cache key: the file is
+    read again when it changes on disk during a long-running process. The
+    preprocessed dataset is also pickled next to the JSON file, keyed by a hash
+    of its contents, so later runs skip parsing and preprocessing entirely.
+    
+    Raises on failure so that errors are not cached.
+    """
+    print(f"Loading dataset from: {data_path} (exists: {data_path.exists()})")
+    
+    # Map the file rather than reading it, so that hashing and parsing work
+    # straight from the page cache without a private copy of the bytes
+    with open(data_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+            memoryview(mapped) as raw_data:
+        digest = hashlib.blake2b(raw_data, digest_size=16)
+        digest.update(f"{_CACHE_VERSION}".encode())
+        cache_path = data_path.parent / f".cache_{digest.hexdigest()}.pkl"
+        
+        dataset = _load_cached_dataset(cache_path)
+        if dataset is not None:
+            print(f"Loaded {len(dataset)} preprocessed Pokémon from cache")
+            return _intern_keys(dataset)
+        
+        dataset = parse_json(raw_data)
+    print(f"Successfully parsed JSON, loaded {len(dataset)} Pokémon")
+    
+    # Preprocess the dataset to add derived attributes; its stats are only
+    # worth printing when debugging
+    dataset = preprocess_pokemon_dataset(_intern_keys(dataset), verbose=logger.isEnabledFor(logging.DEBUG))
+    _save_cached_dataset(cache_path, dataset)
+    return dataset
+
+def load_dataset() -> List[Dict[str, Any]]:
+    """Load Pokémon dataset from JSON file and preprocess it.
+    
+    The file is only parsed again when it changes; other calls return a new
+    list over the same preprocessed entries, which must be treated as read-only.
+    """
+    try:
+        stat = _DATASET_PATH.stat()
+        return list(_read_dataset(_DATASET_PATH, stat.st_mtime_ns, stat.st_size))
+    except json.JSONDecodeError as e:
+        print(f"JSON parsing error: {e}")
+        return []
     except Exception as e:
         print(f"Error loading dataset: {e}")
+        # Only needed on this error path, so not imported at module load
+        import traceback
         traceback.print_exc()
         return []
-        
-    # Preprocess the dataset to add derived attributes
-    return preprocess_pokemon_dataset(dataset, verbose=True)
+
+@functools.lru_cache(maxsize=None)
+def _xlog2x(count: int) -> float:
+    """count * log2(count), with 0 * log2(0) taken as 0."""
+    return count * math.log2(count) if count > 0 else 0.0
+
+def _split_score(yes_count: int, total: int) -> float:
+    """Score a yes/no question by the entropy of the split it makes (lower is better).
+    
+    The score is 1 minus the information gained by the answer, in bits: 0 for
+    an even split, 1 for a question everyone answers the same way. A yes-count
+    and its mirror (total - yes_count) score exactly the same.
+    """
+    entropy = math.log2(total) - (_xlog2x(yes_count) + _xlog2x(total - yes_count)) / total
+    return 1.0 - entropy
 
 class QuestionGenerator:
     """Main class for generating questions and managing game state.
@@ -199,27 +345,175 @@ class QuestionGenerator:
     
     Attributes:
         dataset: List of dictionaries containing Pokémon data
+        current_ids: Positions in the dataset of the Pokémon still possible
+        names: Name of the Pokémon at each dataset position
+        columns: Maps each question attribute to its value at each dataset position;
+                 bytes of codes into ``categories`` for the coded attributes
+        categories: Maps each coded attribute to its values, indexed by code
+        index: Maps each attribute and value to the positions of matching Pokémon
         current_pokemon_set: List of Pokémon still possible based on answers
         type_rarity: Dictionary mapping types to their frequency in the dataset
         asked_questions: Set of questions we've already asked
+        verbose: Whether to print the top questions considered at each turn
     """
     
-    def __init__(self, dataset: List[Dict[str, Any]]):
+    # Whether a Pokémon answers yes to the question about each attribute and value
+    _PREDICATES = {
+        'type': lambda p, v: v in p[_K_TYPES_SET],
+        'primary_color': lambda p, v: v != 'unknown' and p[_K_COLOR] == v,
+        'height_category': lambda p, v: v != 'unknown' and p[_K_HEIGHT] == v,
+        'weight_category': lambda p, v: v != 'unknown' and p[_K_WEIGHT] == v,
+        'can_evolve': lambda p, v: p[_K_CAN_EVOLVE] == v,
+        'letter': lambda p, v: p[_K_FIRST_LETTER] == v,
+    }
+    
+    def __init__(self, dataset: List[Dict[str, Any]], verbose: bool = False):
         """Initialize the game with a Pokémon dataset.
         
         Args:
             dataset: List of dictionaries containing Pokémon data with attributes
                     like type, height, weight, color, etc.
+            verbose: Whether to print the top questions considered at each turn
         """
         self.dataset = dataset
-        self.current_pokemon_set = dataset.copy()
+        self.verbose = verbose
         self.asked_questions = set()  # Track questions we've already asked
         
-        # Calculate type rarity for weighting type questions
-        all_types = []
-        for pokemon in dataset:
-            all_types.extend(pokemon['types'])
-        self.type_rarity = Counter(all_types)
+        # Pokémon still possible, as positions in the dataset
+        self.current_ids = set(range(len(dataset)))
+        self._sorted_ids = None  # current_ids in dataset order, rebuilt after each update
+        self._current_list = None  # current_pokemon_set, rebuilt after each update
+        self._distributions = None  # Counts of each question attribute, rebuilt after each update
+        
+        # Per-attribute columns of the values, indexed by dataset position
+        self.names = tuple(pokemon[_K_NAME] for pokemon in dataset)
+        self.columns = self._build_columns(dataset)
+        
+        # Inverted index: attribute -> value -> positions of the matching Pokémon
+        self.index = self._build_index(self.columns)
+        
+        # Store the few-valued string columns as small int codes, which are
+        # cheaper to count than the strings themselves
+        self.categories = {}
+        for attribute in _CODED_ATTRIBUTES:
+            self.columns[attribute], self.categories[attribute] = self._encode_column(self.columns[attribute])
+        
+        # Calculate type rarity for weighting type questions, straight from the index
+        self.type_rarity = Counter({type_: len(positions) for type_, positions in self.index['type'].items()})
+        
+        # One bit per possible question: attribute -> value -> bit. Questions are
+        # skipped by testing their bit against a mask of the asked questions,
+        # built from asked_questions on top of the questions that are never asked
+        self._question_bits = {}
+        bit = 1
+        for attribute in _QUESTION_ATTRIBUTES:
+            bits = self._question_bits[attribute] = {}
+            for value in self.index[attribute]:
+                bits[value] = bit
+                bit <<= 1
+        self._skipped_mask = self._questions_mask(_SKIPPED_QUESTIONS)
+    
+    def _questions_mask(self, questions) -> int:
+        """Combine the bits of (attribute, value) questions, ignoring unknown ones."""
+        question_bits = self._question_bits
+        mask = 0
+        for attribute, value in questions:
+            mask |= question_bits.get(attribute, {}).get(value, 0)
+        return mask
+    
+    @staticmethod
+    def _build_columns(dataset: List[Dict[str, Any]]) -> Dict[str, Tuple[Any, ...]]:
+        """Extract the value of every question attribute for each Pokémon.
+        
+        The dataset must have been preprocessed, which sets every field read here.
+        """
+        return {
+            'type': tuple(tuple(pokemon[_K_TYPES]) for pokemon in dataset),
+            'primary_color': tuple(pokemon[_K_COLOR] for pokemon in dataset),
+            'height_category': tuple(pokemon[_K_HEIGHT] for pokemon in dataset),
+            'weight_category': tuple(pokemon[_K_WEIGHT] for pokemon in dataset),
+            'can_evolve': tuple(bool(pokemon[_K_CAN_EVOLVE]) for pokemon in dataset),
+            'letter': tuple(pokemon[_K_FIRST_LETTER] for pokemon in dataset),
+        }
+    
+    @staticmethod
+    def _encode_column(column: Tuple[Any, ...]) -> Tuple[bytes, Tuple[Any, ...]]:
+        """Encode a column of at most 256 distinct values as one byte per Pokémon.
+        
+        Returns:
+            Tuple of (code of each value, distinct values in order of first appearance)
+        """
+        codes = {}
+        encoded = bytes(codes.setdefault(value, len(codes)) for value in column)
+        return encoded, tuple(codes)
+    
+    @staticmethod
+    def _build_index(columns: Dict[str, Tuple[Any, ...]]) -> Dict[str, Dict[Any, Set[int]]]:
+        """Map every attribute value to the positions of the Pokémon that have it."""
+        index = {}
+        for attribute, column in columns.items():
+            positions_by_value = index[attribute] = defaultdict(set)
+            if attribute == 'type':
+                for position, types in enumerate(column):
+                    for type_ in types:
+                        positions_by_value[type_].add(position)
+            else:
+                for position, value in enumerate(column):
+                    positions_by_value[value].add(position)
+        
+        # Nameless Pokémon have no letter to ask about
+        index['letter'].pop('', None)
+        return index
+    
+    def _current_positions(self) -> List[int]:
+        """Positions of the remaining Pokémon, in dataset order."""
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.current_ids)
+        return self._sorted_ids
+    
+    @property
+    def current_pokemon_set(self) -> List[Dict[str, Any]]:
+        """Pokémon still possible based on answers, in dataset order.
+        
+        The list is shared between calls until the next update and must not be modified.
+        """
+        if self._current_list is None:
+            self._current_list = [self.dataset[position] for position in self._current_positions()]
+        return self._current_list
+    
+    def _current_distribution(self, attribute: str) -> Counter:
+        """Count the values of an attribute among the remaining Pokémon.
+        
+        Values are counted in dataset order, the same order a scan of
+        ``current_pokemon_set`` would produce, so that ties between equally
+        good questions are broken the same way.
+        """
+        values = map(self.columns[attribute].__getitem__, self._current_positions())
+        if attribute == 'type':
+            values = chain.from_iterable(values)
+        counts = Counter(values)
+        
+        categories = self.categories.get(attribute)
+        if categories is not None:
+            # Codes are first seen in the same order as their values, so this keeps the counting order
+            counts = Counter({categories[code]: count for code, count in counts.items()})
+        
+        # Only count known values
+        counts.pop('unknown', None)
+        counts.pop(None, None)
+        return counts
+    
+    def _current_distributions(self) -> Dict[str, Counter]:
+        """Distributions of every question attribute among the remaining Pokémon.
+        
+        Computed once per update and shared between calls, so they must not be modified.
+        """
+        if self._distributions is None:
+            self._distributions = {
+                attribute: self._current_distribution(attribute)
+                for attribute in _QUESTION_ATTRIBUTES
+            }
+        return self._distributions
     
     def get_type_distribution(self, pokemon_set: List[Dict[str, Any]]) -> Counter:
         """Get distribution of Pokémon types in the given set.
@@ -230,110 +524,59 @@ class QuestionGenerator:
         Returns:
             Counter mapping types to their frequency
         """
-        types = []
-        for pokemon in pokemon_set:
-            types.extend(pokemon['types'])
-        return Counter(types)
+        counts = self._column_distribution(pokemon_set, 'type')
+        if counts is None:
+            counts = Counter(chain.from_iterable(map(itemgetter(_K_TYPES), pokemon_set)))
+        return counts
     
-    def get_visual_attribute_distribution(self, pokemon_set: List[Dict[str, Any]], attribute: str) -> Counter:
-        """Get distribution of visual attributes."""
-        print(f"\n[DEBUG] Getting visual distribution for '{attribute}'")
-        print(f"[DEBUG] Pokémon set size: {len(pokemon_set)}")
+    def _column_distribution(self, pokemon_set: List[Dict[str, Any]], attribute: str) -> Optional[Counter]:
+        """Copy of the column-store counts of an attribute, if pokemon_set is the current set.
         
-        counts = Counter()
-        key = f"visual_{attribute}"
+        Returns:
+            A new Counter callers may modify, or None when the set has to be scanned
+        """
+        if pokemon_set is self._current_list and attribute in _QUESTION_ATTRIBUTES:
+            return Counter(self._current_distributions()[attribute])
+        return None
+    
+    def _count_field(self, pokemon_set: List[Dict[str, Any]], field: str, skip_unknown: bool = True) -> Counter:
+        """Count the values of a per-Pokémon field.
         
-        # Don't show all Pokemon in debug to avoid cluttering
-        for i, pokemon in enumerate(pokemon_set[:5]):
-            print(f"[DEBUG] Pokemon {i+1}: {pokemon['nom']} - {key}: {pokemon.get(key, 'unknown')}")
+        Args:
+            pokemon_set: List of Pokémon to analyze
+            field: Name of the field to count
+            skip_unknown: Whether to leave out missing and 'unknown' values
             
-            # Only count non-unknown values
-            if pokemon.get(key, "unknown") != "unknown":
-                counts[pokemon.get(key, "unknown")] += 1
-        
-        # Process the rest silently
-        for pokemon in pokemon_set[5:]:
-            if pokemon.get(key, "unknown") != "unknown":
-                counts[pokemon.get(key, "unknown")] += 1
-        
-        unknown_count = len(pokemon_set) - sum(counts.values())
-        print(f"[DEBUG] Visual attribute counts: {dict(counts)}")
-        print(f"[DEBUG] Unknown visual attributes: {unknown_count}/{len(pokemon_set)}")
+        Returns:
+            Counter mapping the values to their frequency
+        """
+        counts = None
+        if field in _COLUMN_KEYS:
+            counts = self._column_distribution(pokemon_set, _COLUMN_KEYS[field])
+        if counts is None:
+            if skip_unknown:
+                counts = Counter(value for pokemon in pokemon_set
+                                 if (value := pokemon.get(field, 'unknown')) != 'unknown')
+            else:
+                counts = Counter(map(itemgetter(field), pokemon_set))
+        logger.debug("%s counts over %d Pokémon: %s", field, len(pokemon_set), counts)
         return counts
+    
+    def get_visual_attribute_distribution(self, pokemon_set: List[Dict[str, Any]], attribute: str) -> Counter:
+        """Get distribution of visual attributes."""
+        return self._count_field(pokemon_set, f"visual_{attribute}")
 
     def get_height_distribution(self, pokemon_set: List[Dict[str, Any]]) -> Counter:
         """Get distribution of height categories."""
-        print("\n[DEBUG] Getting height distribution")
-        print(f"[DEBUG] Pokémon set size: {len(pokemon_set)}")
-        
-        counts = Counter()
-        
-        # Don't show all Pokemon in debug to avoid cluttering
-        for i, pokemon in enumerate(pokemon_set[:5]):
-            category = pokemon.get("height_category", "unknown")
-            print(f"[DEBUG] Pokemon {i+1}: {pokemon['nom']} - height_category: {category}")
-            
-            # Only count non-unknown values
-            if category != "unknown":
-                counts[category] += 1
-        
-        # Process the rest silently
-        for pokemon in pokemon_set[5:]:
-            category = pokemon.get("height_category", "unknown")
-            if category != "unknown":
-                counts[category] += 1
-        
-        unknown_count = len(pokemon_set) - sum(counts.values())
-        print(f"[DEBUG] Height category counts: {dict(counts)}")
-        print(f"[DEBUG] Unknown height categories: {unknown_count}/{len(pokemon_set)}")
-        return counts
+        return self._count_field(pokemon_set, _K_HEIGHT)
     
     def get_weight_distribution(self, pokemon_set: List[Dict[str, Any]]) -> Counter:
         """Get distribution of weight categories."""
-        print("\n[DEBUG] Getting weight distribution")
-        print(f"[DEBUG] Pokémon set size: {len(pokemon_set)}")
-        
-        counts = Counter()
-        
-        # Don't show all Pokemon in debug to avoid cluttering
-        for i, pokemon in enumerate(pokemon_set[:5]):
-            category = pokemon.get("weight_category", "unknown")
-            print(f"[DEBUG] Pokemon {i+1}: {pokemon['nom']} - weight_category: {category}")
-            
-            # Only count non-unknown values
-            if category != "unknown":
-                counts[category] += 1
-        
-        # Process the rest silently
-        for pokemon in pokemon_set[5:]:
-            category = pokemon.get("weight_category", "unknown")
-            if category != "unknown":
-                counts[category] += 1
-        
-        unknown_count = len(pokemon_set) - sum(counts.values())
-        print(f"[DEBUG] Weight category counts: {dict(counts)}")
-        print(f"[DEBUG] Unknown weight categories: {unknown_count}/{len(pokemon_set)}")
-        return counts
+        return self._count_field(pokemon_set, _K_WEIGHT)
     
     def get_evolution_distribution(self, pokemon_set: List[Dict[str, Any]]) -> Counter:
         """Get distribution of evolution capability in the given set."""
-        print("\n[DEBUG] Getting evolution distribution")
-        print(f"[DEBUG] Pokémon set size: {len(pokemon_set)}")
-        
-        values = []
-        # Show first few Pokémon for debugging
-        for i, pokemon in enumerate(pokemon_set[:5]):
-            can_evolve_val = pokemon.get('can_evolve', False)
-            print(f"[DEBUG] Pokemon {i+1}: {pokemon['nom']} - can_evolve: {can_evolve_val}")
-            values.append(can_evolve_val)
-        
-        # Process the rest silently
-        values.extend([p.get('can_evolve', False) for p in pokemon_set[5:]])
-        
-        counter = Counter(values)
-        print(f"[DEBUG] Evolution capability counts: {dict(counter)}")
-        print(f"[DEBUG] True ratio: {counter[True]/len(pokemon_set)*100:.1f}% can evolve")
-        return counter
+        return self._count_field(pokemon_set, _K_CAN_EVOLVE, skip_unknown=False)
     
     def get_letter_distribution(self, pokemon_set: List[Dict[str, Any]]) -> Counter:
         """Get distribution of first letters in Pokémon names.
@@ -346,57 +589,62 @@ class QuestionGenerator:
         Returns:
             Counter mapping normalized first letters to their frequency
         """
-        values = []
-        for pokemon in pokemon_set:
-            if pokemon['nom']:
-                values.append(normalize_letter(pokemon['nom'][0]))
-        return Counter(values)
+        if pokemon_set is self._current_list:
+            # Count the precomputed letter column instead of the dicts
+            counts = self._current_distribution('letter')
+            counts.pop('', None)
+            return counts
+        return Counter(letter for pokemon in pokemon_set if (letter := pokemon[_K_FIRST_LETTER]))
+    
+    def count_matching(self, attribute: str, value: Any,
+                       pokemon_set: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Count the Pokémon that would answer yes to the question about an attribute value.
+        
+        Args:
+            attribute: Question attribute, as returned by generate_question
+            value: Value asked about
+            pokemon_set: Pokémon to count among; the remaining Pokémon if None
+            
+        Returns:
+            Number of matching Pokémon, 0 for attributes no question is asked about
+        """
+        if pokemon_set is None or pokemon_set is self._current_list:
+            if attribute in _QUESTION_ATTRIBUTES:
+                # Counting the remaining Pokémon: read the count from the cached distributions
+                return self._current_distributions()[attribute][value]
+            pokemon_set = self.current_pokemon_set
+        
+        # Pick the test once, rather than branching on the attribute per Pokémon
+        matches = self._PREDICATES.get(attribute)
+        return sum(1 for p in pokemon_set if matches(p, value)) if matches else 0
     
     def calculate_question_score(self, attribute: str, value: Any, pokemon_set: List[Dict[str, Any]]) -> float:
         """Calculate question score using information gain for the attribute-value pair."""
-        if attribute == 'can_evolve':
-            # Handle boolean attributes using the same scoring as other attributes
-            total = len(pokemon_set)
-            yes_count = sum(1 for p in pokemon_set if p.get(attribute) == value)
-            yes_ratio = yes_count/total * 100
-            score = abs(0.5 - yes_ratio/100)  # Changed to match other attribute scoring
-            print(f"[DEBUG] Scoring evolution question: yes={yes_count}/{total} ({yes_ratio:.1f}%), score={score:.3f}")
-            return score
-        else:
-            yes_count = 0
-            total = len(pokemon_set)
-            
-            # Get the actual count for this attribute/value
-            if attribute == 'type':
-                yes_count = self.get_type_distribution(pokemon_set)[value]
-            elif attribute == 'primary_color':
-                yes_count = self.get_visual_attribute_distribution(pokemon_set, 'primary_color')[value]
-            elif attribute == 'height_category':
-                yes_count = self.get_height_distribution(pokemon_set)[value]
-            elif attribute == 'weight_category':
-                yes_count = self.get_weight_distribution(pokemon_set)[value]
-                
-            yes_ratio = yes_count/total * 100
-            score = abs(0.5 - yes_ratio/100)
-            print(f"[DEBUG] Scoring {attribute} question for '{value}': yes={yes_count}/{total} ({yes_ratio:.1f}%), score={score:.3f}")
-            return score
-    
-    def evaluate_questions(self) -> List[Tuple[float, str, Tuple[str, Any]]]:
-        """Evaluate all possible questions and return ranked list."""
-        print("\n[DEBUG] Starting question evaluation")
+        total = len(pokemon_set)
+        yes_count = self.count_matching(attribute, value, pokemon_set)
+        
+        score = _split_score(yes_count, total)
+        yes_ratio = yes_count/total * 100
+        logger.debug("Scoring %s question for '%s': yes=%d/%d (%.1f%%), score=%.3f",
+                     attribute, value, yes_count, total, yes_ratio, score)
+        return score
+    
+    def evaluate_questions(self, limit: Optional[int] = None) -> Tuple[List[Tuple[float, str, Tuple[str, Any]]], Dict[str, Counter]]:
+        """Evaluate all possible questions and return ranked list.
+        
+        Args:
+            limit: Only return (and create the text of) this many of the best
+                   questions; all of them if None
         
+        Returns:
+            Tuple of (questions sorted by score, attribute distributions they
+            were scored from), so callers can reuse the counts; the
+            distributions are shared until the next update and must not be modified
+        """
         # Get distributions for each attribute
-        distributions = {
-            'type': self.get_type_distribution(self.current_pokemon_set),
-            'primary_color': self.get_visual_attribute_distribution(self.current_pokemon_set, 'primary_color'),
-            'height_category': self.get_height_distribution(self.current_pokemon_set),
-            'weight_category': self.get_weight_distribution(self.current_pokemon_set),
-            'can_evolve': self.get_evolution_distribution(self.current_pokemon_set),
-        }
+        distributions = self._current_distributions()
         
-        print("\n[DEBUG] Initial distributions:")
-        for attr, dist in distributions.items():
-            print(f"[DEBUG] {attr}: {dict(dist)}")
+        logger.debug("Initial distributions: %s", distributions)
         
         # Filter out empty or singleton distributions
         valid_distributions = {}
@@ -404,47 +652,45 @@ class QuestionGenerator:
             if len(dist) > 1:  # Need at least 2 values to form a meaningful question
                 valid_distributions[attr] = dist
             else:
-                print(f"[DEBUG] Filtered out {attr} - only has {len(dist)} values: {dict(dist)}")
-        
-        print(f"\n[DEBUG] After filtering - remaining distributions: {list(valid_distributions.keys())}")
-        
-        questions = []
-        
-        # Generate questions for each attribute and value
-        for attr, dist in valid_distributions.items():
-            for value, count in dist.items():
-                # Skip already asked questions
-                if (attr, value) in self.asked_questions:
-                    continue
-                    
-                # Skip medium/average categories for height and weight
-                if (attr == 'height_category' and value == 'medium') or \
-                   (attr == 'weight_category' and value == 'medium'):
-                    continue
-                
-                score = self.calculate_question_score(attr, value, self.current_pokemon_set)
-                
-                # Create question text
-                question = generate_question(attr, value)
-                
-                # Debug output
-                if attr == 'height_category':
-                    french_value = 'petit' if value == 'small' else 'grand' if value == 'large' else 'moyen'
-                elif attr == 'weight_category':
-                    french_value = 'léger' if value == 'light' else 'lourd' if value == 'heavy' else 'moyen'
-                elif attr == 'primary_color':
-                    french_value = COLOR_TRANSLATIONS.get(value, value)
-                else:
-                    french_value = value
-                
-                print(f"[DEBUG] Created {attr} question for '{value}' (fr: '{french_value}') with score {score}")
-                questions.append((score, question, (attr, value)))
-        
-        # Debug total questions
-        print(f"\n[DEBUG] Total questions generated: {len(questions)}")
-        
-        # Sort by score (lower is better)
-        return sorted(questions, key=lambda x: x[0])
+                logger.debug("Filtered out %s - only has %d values: %s", attr, len(dist), dist)
+        
+        logger.debug("After filtering - remaining distributions: %s", list(valid_distributions))
+        
+        total = len(self.current_ids)
+        
+        # Flatten the candidate questions, skipping those already asked and the
+        # ones never asked about
+        asked = self._skipped_mask | self._questions_mask(self.asked_questions)
+        question_bits = self._question_bits
+        candidates = [
+            (attr, value, count)
+            for attr, dist in valid_distributions.items()
+            for bits in (question_bits[attr],)
+            for value, count in dist.items()
+            if not asked & bits[value]
+        ]
+        
+        # Score every candidate in one pass
+        scored = [(_split_score(count, total), (attr, value)) for attr, value, count in candidates]
+        
+        # Debug output
+        if logger.isEnabledFor(logging.DEBUG):
+            for score, (attr, value) in scored:
+                french_value = _FRENCH_VALUES.get(attr, {}).get(value, value)
+                logger.debug("Scored %s question for '%s' (fr: '%s') with score %s", attr, value, french_value, score)
+            logger.debug("Total questions generated: %d", len(scored))
+        
+        # Rank by score (lower is better); both are stable, so ties keep their order.
+        # When only the best few are wanted, a bounded heap avoids sorting them all
+        if limit is None:
+            scored.sort(key=itemgetter(0))
+        else:
+            scored = heapq.nsmallest(limit, scored, key=itemgetter(0))
+        
+        # Only create the question text for the questions that will be used
+        questions = [(score, generate_question(*attr_value), attr_value)
+                     for score, attr_value in scored]
+        return questions, distributions
     
     def generate_question(self) -> Tuple[str, Tuple[str, Any]]:
         """Generate the best question to ask based on current Pokémon set.
@@ -454,39 +700,30 @@ class QuestionGenerator:
             For final guesses: (question_text, ('final_guess', pokemon_name))
             For errors: (error_text, ('error', None))
         """
-        if len(self.current_pokemon_set) == 0:
+        total = len(self.current_ids)
+        if total == 0:
             return generate_error_message(), ('error', None)
-        elif len(self.current_pokemon_set) == 1:
-            return generate_final_guess_question(self.current_pokemon_set[0]['nom']), ('final_guess', self.current_pokemon_set[0]['nom'])
+        elif total == 1:
+            name = self.names[min(self.current_ids)]
+            return generate_final_guess_question(name), ('final_guess', name)
             
-        questions = self.evaluate_questions()
+        # Only the best question is asked; the top 5 are shown when verbose
+        questions, distributions = self.evaluate_questions(limit=5 if self.verbose else 1)
         if not questions:
             # If we can't generate a good question, make a guess
-            return generate_final_guess_question(self.current_pokemon_set[0]['nom']), ('final_guess', self.current_pokemon_set[0]['nom'])
+            name = self.names[min(self.current_ids)]
+            return generate_final_guess_question(name), ('final_guess', name)
             
         # Display top 5 questions with their split ratios
-        print("\nAnalyzing", len(self.current_pokemon_set), "remaining Pokémon...\n")
-        print("Top questions being considered:")
-        for i, (score, question, (attr, value)) in enumerate(questions[:5], 1):
-            count = 0
-            total = len(self.current_pokemon_set)
-            
-            # Get the actual count for this attribute/value
-            if attr == 'type':
-                count = self.get_type_distribution(self.current_pokemon_set)[value]
-            elif attr == 'primary_color':
-                count = self.get_visual_attribute_distribution(self.current_pokemon_set, 'primary_color')[value]
-            elif attr == 'height_category':
-                count = self.get_height_distribution(self.current_pokemon_set)[value]
-            elif attr == 'weight_category':
-                count = self.get_weight_distribution(self.current_pokemon_set)[value]
-            elif attr == 'can_evolve':
-                count = self.get_evolution_distribution(self.current_pokemon_set)[value]
-                
-            yes_ratio = count/total * 100
-            print(f"{i}. Score: {score:.3f} ({count}/{total} = {yes_ratio:.1f}% yes, {100-yes_ratio:.1f}% no)")
-            print(f"   Question: {question}")
-        print()
+        if self.verbose:
+            print("\nAnalyzing", total, "remaining Pokémon...\n")
+            print("Top questions being considered:")
+            for i, (score, question, (attr, value)) in enumerate(questions[:5], 1):
+                count = distributions[attr][value]
+                yes_ratio = count/total * 100
+                print(f"{i}. Score: {score:.3f} ({count}/{total} = {yes_ratio:.1f}% yes, {100-yes_ratio:.1f}% no)")
+                print(f"   Question: {question}")
+            print()
         
         # Use the best question and mark it as asked
         _, question, attr_value = questions[0]
@@ -498,40 +735,27 @@ class QuestionGenerator:
         if attribute == 'error' or attribute == 'final_guess':
             return
             
-        print(f"\n[DEBUG] Filtering Pokémon for {attribute}={value} (answer: {answer})")
-        print(f"[DEBUG] Before filtering: {len(self.current_pokemon_set)} Pokémon")
+        logger.debug("Filtering Pokémon for %s=%s (answer: %s), %d before",
+                     attribute, value, answer, len(self.current_ids))
         
-        new_set = []
-        for pokemon in self.current_pokemon_set:
-            matches = False
-            
-            if attribute == 'type':
-                matches = value in pokemon['types']
-            elif attribute == 'primary_color':
-                matches = pokemon.get('visual_primary_color') == value
-            elif attribute == 'height_category':
-                matches = pokemon.get('height_category') == value
-            elif attribute == 'weight_category':
-                matches = pokemon.get('weight_category') == value
-            elif attribute == 'can_evolve':
-                # For "is final form" question, we want Pokémon that CANNOT evolve
-                # For "can evolve" question, we want Pokémon that CAN evolve
-                is_final_form = not pokemon.get('can_evolve', False)
-                matches = is_final_form if value == False else not is_final_form
-            elif attribute == 'letter':
-                matches = normalize_letter(pokemon['nom'][0]) == value
-            
-            if matches == answer:
-                new_set.append(pokemon)
-                print(f"[DEBUG] Keeping {pokemon['id']} - {pokemon['nom']} (can_evolve={pokemon.get('can_evolve', 'unknown')})")
+        if attribute == 'can_evolve':
+            # False asks "is it a final form?", anything else asks "can it evolve?"
+            value = value != False
+        matching = self.index.get(attribute, {}).get(value, set())
         
-        self.current_pokemon_set = new_set
-        print(f"[DEBUG] After filtering: {len(self.current_pokemon_set)} Pokémon")
+        if answer:
+            self.current_ids &= matching
+        else:
+            self.current_ids -= matching
+        self._sorted_ids = None
+        self._current_list = None
+        self._distributions = None
+        logger.debug("After filtering: %d Pokémon", len(self.current_ids))
     
     def get_remaining_count(self) -> int:
         """Get the number of remaining possible Pokemon"""
-        return len(self.current_pokemon_set)
+        return len(self.current_ids)
     
     def get_possible_pokemon(self) -> List[str]:
         """Get the names of all possible Pokemon remaining"""
-        return [p['nom'] for p in self.current_pokemon_set]
+        return [self.names[position] for position in self._current_positions()]
@@ -1,32 +1,162 @@
 """Voice module for the Pokenator game.
 
 This module handles text-to-speech functionality for the game.
+
+Diagnostics go through the ``pokenator.voice`` logger; enable them with
+``logging.getLogger('pokenator.voice').setLevel(logging.DEBUG)``.
 """
 from pathlib import Path
+import functools
 import os
 import hashlib
+import logging
+import pickle
 import re
-import time
+import string
 from typing import Optional, Dict, List, Set
 import csv
 
+from .cache import save_pickle_atomic
+
+logger = logging.getLogger(__name__)
+
 # Try to import pygame for audio playback
 try:
     import pygame
     PYGAME_AVAILABLE = True
 except ImportError:
     PYGAME_AVAILABLE = False
-    print("[VOICE] Pygame not available. Audio playback disabled.")
+    logger.warning("Pygame not available. Audio playback disabled.")
 except Exception:
     PYGAME_AVAILABLE = False
-    print("[VOICE] Error initializing pygame. Audio playback disabled.")
+    logger.warning("Error initializing pygame. Audio playback disabled.")
+
+# Mixer settings matching gTTS output (24 kHz mono MP3); the buffer is large
+# enough to avoid underruns on a busy system
+MIXER_FREQUENCY = 24000
+MIXER_CHANNELS = 1
+MIXER_BUFFER = 2048
+
+# Interval at which blocking playback checks whether the track has finished
+PLAYBACK_POLL_MS = 5
+
+# Most texts spoken are the same few hundred prompts; past this many distinct
+# texts outside the voice mapping, the path cache is reset rather than left to
+# grow without bound
+_PATH_CACHE_SIZE = 1024
+
+# Version of the pickled voice mapping sidecar; bump it when its layout changes
+_MAPPING_CACHE_VERSION = 1
+
+# Phrases identifying the evolution questions, matched in one pass and mapped
+# to the voice mapping key of their pre-generated audio
+_EVOLUTION_RE = re.compile(r"peut évoluer|forme finale|ne peut plus évoluer")
+_EVOLUTION_KEYS = {
+    "peut évoluer": "evolution_can",
+    "forme finale": "evolution_cannot",
+    "ne peut plus évoluer": "evolution_cannot",
+}
+
+class _FilenameTable(dict):
+    """str.translate table replacing every character outside [a-zA-Z0-9] with '_'."""
+    
+    def __missing__(self, codepoint: int) -> str:
+        return '_'
+
+# Turns text into the safe prefix of an audio filename. Latin-1 is filled in
+# up front so French text never falls through to __missing__
+FILENAME_TABLE = _FilenameTable({i: '_' for i in range(256)})
+FILENAME_TABLE.update({ord(c): c for c in string.ascii_letters + string.digits})
+
+def hashed_audio_path(text: str, lang_dir: Path) -> Path:
+    """Deterministic audio file path for a text, derived from the text itself.
+    
+    Shared by the game and the audio generation scripts, so that they agree
+    on which file holds each text. Files generated before the switch to BLAKE2
+    carry an MD5-based suffix; if such a file already exists it is returned
+    instead.
+    
+    Args:
+        text: Text spoken in the audio file
+        lang_dir: Audio directory of the text's language
+        
+    Returns:
+        Path to the audio file
+    """
+    prefix = text[:30].lower().translate(FILENAME_TABLE)
+    text_hash = hashlib.blake2b(text.encode('utf-8'), digest_size=4).hexdigest()
+    audio_path = lang_dir / f"{prefix}_{text_hash}.mp3"
+    if not audio_path.exists():
+        legacy_hash = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+        legacy_path = lang_dir / f"{prefix}_{legacy_hash}.mp3"
+        if legacy_path.exists():
+            return legacy_path
+    return audio_path
+
+@functools.lru_cache(maxsize=64)
+def _load_sound(path: str) -> 'pygame.mixer.Sound':
+    """Decode an audio file once; the recurring prompts are then played from memory."""
+    return pygame.mixer.Sound(path)
+
+def _load_cached_mapping(sidecar: Path, mtime_ns: int, size: int) -> Optional[Dict[str, str]]:
+    """Load a voice mapping pickled by _save_cached_mapping, if it matches the CSV."""
+    try:
+        with open(sidecar, 'rb') as f:
+            version, cached_mtime_ns, cached_size, mapping = pickle.load(f)
+    except Exception:
+        # Missing, corrupt or incompatible sidecars are rebuilt from the CSV
+        return None
+    if (version, cached_mtime_ns, cached_size) != (_MAPPING_CACHE_VERSION, mtime_ns, size):
+        return None
+    return mapping
+
+def _save_cached_mapping(sidecar: Path, mtime_ns: int, size: int, mapping: Dict[str, str]) -> None:
+    """Pickle a parsed voice mapping next to its CSV, stamped with the CSV's version."""
+    try:
+        save_pickle_atomic(sidecar, (_MAPPING_CACHE_VERSION, mtime_ns, size, mapping))
+    except OSError as e:
+        # The CSV is simply parsed again next time
+        logger.debug("Could not write voice mapping cache %s: %s", sidecar, e)
+
+@functools.lru_cache(maxsize=8)
+def _read_voice_mapping(mapping_file: Path, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse a voice mapping CSV, once per file version.
+    
+    The modification time and size are part of the cache key, so an edited
+    mapping is re-read while switching back and forth between languages is
+    free. The parsed mapping is also pickled next to the CSV, so later runs
+    skip parsing it. The returned dict is shared between engines and must not
+    be modified.
+    """
+    sidecar = mapping_file.with_name('.voice_mapping.pkl')
+    mapping = _load_cached_mapping(sidecar, mtime_ns, size)
+    if mapping is not None:
+        return mapping
+    
+    mapping = {}
+    with open(mapping_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        key_idx, text_idx, filename_idx = header.index('key'), header.index('text'), header.index('filename')
+        for row in reader:
+            filename = row[filename_idx]
+            mapping[row[key_idx]] = filename
+            # Also map the text directly to the filename for backward compatibility
+            mapping[row[text_idx]] = filename
+    _save_cached_mapping(sidecar, mtime_ns, size, mapping)
+    return mapping
 
 class VoiceEngine:
     """Voice engine for text-to-speech functionality."""
     
+    __slots__ = ('enabled', 'language', 'audio_dir', 'use_pregenerated', 'audio_buffer',
+                 '_engine', '_initialized', '_available_files', 'voice_mapping',
+                 'mixer_initialized', '_lang_dir', '_path_cache')
+    
     def __init__(self, enabled: bool = False, language: str = 'fr', 
                  audio_dir: Optional[Path] = None,
-                 use_pregenerated: bool = True):
+                 use_pregenerated: bool = True,
+                 audio_buffer: int = MIXER_BUFFER):
         """Initialize the voice engine.
         
         Args:
@@ -34,39 +164,73 @@ class VoiceEngine:
             language: Language code (e.g., 'fr' for French)
             audio_dir: Directory containing pre-generated audio files
             use_pregenerated: Whether to use pre-generated audio files
+            audio_buffer: Mixer buffer size in samples
         """
         self.enabled = enabled
         self.language = language
         self.audio_dir = audio_dir or Path(__file__).parent.parent / 'audio'
         self.use_pregenerated = use_pregenerated
+        self.audio_buffer = audio_buffer
+        self._lang_dir = self.audio_dir / language  # Directory of the current language
         
         # Voice engine will be initialized when needed
         self._engine = None
         self._initialized = False
         self._available_files = set()
         self.voice_mapping = self._load_voice_mapping()
+        self._path_cache: Dict[str, Path] = self._build_path_table()  # Resolved audio path per text
         
-        # Initialize pygame mixer if available
-        if PYGAME_AVAILABLE:
-            try:
-                pygame.mixer.init()
-                self.mixer_initialized = True
-            except Exception as e:
-                print(f"[VOICE] Failed to initialize pygame mixer: {e}")
-                self.mixer_initialized = False
-        else:
-            self.mixer_initialized = False
+        # The pygame mixer is opened on the first utterance, see ensure_mixer
+        self.mixer_initialized = False
         
         # Load available audio files if the directory exists
         if self.use_pregenerated and self.audio_dir.exists():
             self._load_available_files()
     
+    def ensure_mixer(self) -> bool:
+        """Initialize the pygame mixer if it isn't already.
+        
+        Called on the first utterance, so an engine that never speaks (such as
+        the disabled default engine) never opens an audio device. Callers that
+        play audio through pygame themselves can call it up front.
+        
+        Returns:
+            True if the mixer is ready for playback, False otherwise
+        """
+        if self.mixer_initialized or not PYGAME_AVAILABLE:
+            return self.mixer_initialized
+        try:
+            # Keep the settings of a mixer some other code already opened
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency=MIXER_FREQUENCY, size=-16,
+                                  channels=MIXER_CHANNELS, buffer=self.audio_buffer)
+            self.mixer_initialized = True
+        except Exception as e:
+            logger.warning("Failed to initialize pygame mixer: %s", e)
+        return self.mixer_initialized
+    
     def _load_available_files(self) -> None:
         """Load the list of available pre-generated audio files."""
         self._available_files = set()
-        if self.audio_dir.exists():
-            for file in self.audio_dir.glob(f"**/{self.language}/*.mp3"):
-                self._available_files.add(file.stem)
+        if not self._lang_dir.is_dir():
+            return
+        # Only the language's own directory is read, instead of walking the whole tree
+        with os.scandir(self._lang_dir) as entries:
+            self._available_files = {entry.name[:-4] for entry in entries if entry.name.endswith('.mp3')}
+    
+    def _audio_exists(self, audio_path: Path) -> bool:
+        """Check whether an audio file of the current language directory exists.
+        
+        Files in the directory listing are answered from memory; others are
+        looked up on disk and added to the listing when found (e.g. generated
+        since the listing was taken).
+        """
+        if audio_path.stem in self._available_files:
+            return True
+        if audio_path.exists():
+            self._available_files.add(audio_path.stem)
+            return True
+        return False
     
     def _load_voice_mapping(self) -> Dict[str, str]:
         """Load voice mapping from CSV file.
@@ -75,49 +239,57 @@ class VoiceEngine:
             Dictionary mapping keys to audio filenames
         """
         mapping = {}
-        mapping_file = self.audio_dir / self.language / 'voice_mapping.csv'
+        mapping_file = self._lang_dir / 'voice_mapping.csv'
         
         if mapping_file.exists():
             try:
-                with open(mapping_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        mapping[row['key']] = row['filename']
-                        # Also map the text directly to the filename for backward compatibility
-                        mapping[row['text']] = row['filename']
-                print(f"[VOICE] Loaded {len(mapping)} voice mappings from {mapping_file}")
+                stat = mapping_file.stat()
+                mapping = _read_voice_mapping(mapping_file, stat.st_mtime_ns, stat.st_size)
+                logger.debug("Loaded %d voice mappings from %s", len(mapping), mapping_file)
             except Exception as e:
-                print(f"[VOICE] Error loading voice mapping: {e}")
+                logger.warning("Error loading voice mapping: %s", e)
         
         return mapping
     
+    def _build_path_table(self) -> Dict[str, Path]:
+        """Resolve the path of every key and text in the voice mapping up front."""
+        lang_dir = self._lang_dir
+        return {text: lang_dir / filename for text, filename in self.voice_mapping.items()}
+    
     def _get_audio_path(self, text: str) -> Path:
         """Generate a deterministic filename based on the text content.
         
+        Paths are cached per text for the current language and mapping, so
+        each prompt is only hashed once.
+        
         Args:
             text: Text to generate filename for
             
         Returns:
             Path to the audio file
         """
+        audio_path = self._path_cache.get(text)
+        if audio_path is None:
+            if len(self._path_cache) >= _PATH_CACHE_SIZE + len(self.voice_mapping):
+                self._path_cache = self._build_path_table()
+            audio_path = self._path_cache[text] = self._resolve_audio_path(text)
+        return audio_path
+    
+    def _resolve_audio_path(self, text: str) -> Path:
+        """Resolve the audio path for a text without consulting the cache."""
         # First check if we have a mapping for this text
         if text in self.voice_mapping:
-            return self.audio_dir / self.language / self.voice_mapping[text]
-        
-        # Check for special keys (evolution questions)
-        if "peut évoluer" in text:
-            if "evolution_can" in self.voice_mapping:
-                return self.audio_dir / self.language / self.voice_mapping["evolution_can"]
+            return self._lang_dir / self.voice_mapping[text]
         
-        if "forme finale" in text or "ne peut plus évoluer" in text:
-            if "evolution_cannot" in self.voice_mapping:
-                return self.audio_dir / self.language / self.voice_mapping["evolution_cannot"]
+        # Check for special keys (evolution questions), preferring evolution_can
+        # when a text matches both
+        evolution_keys = {_EVOLUTION_KEYS[phrase] for phrase in _EVOLUTION_RE.findall(text)}
+        for key in ("evolution_can", "evolution_cannot"):
+            if key in evolution_keys and key in self.voice_mapping:
+                return self._lang_dir / self.voice_mapping[key]
         
         # Fall back to the hash-based filename
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-        prefix = re.sub(r'[^a-zA-Z0-9]', '_', text[:30].lower())
-        filename = f"{prefix}_{text_hash[:8]}.mp3"
-        return self.audio_dir / self.language / filename
+        return hashed_audio_path(text, self._lang_dir)
     
     def initialize(self) -> bool:
         """Initialize the voice engine.
@@ -131,7 +303,7 @@ class VoiceEngine:
         # If using pre-generated files, just check if the directory exists
         if self.use_pregenerated:
             if not self.audio_dir.exists():
-                print(f"[VOICE] Audio directory not found: {self.audio_dir}")
+                logger.warning("Audio directory not found: %s", self.audio_dir)
                 return False
             self._load_available_files()
             self._initialized = True
@@ -160,37 +332,38 @@ class VoiceEngine:
         # If using pre-generated files, try to find and play the file
         if self.use_pregenerated:
             audio_path = self._get_audio_path(text)
-            if audio_path.exists():
+            if self._audio_exists(audio_path):
                 # Play the audio file using pygame if available
                 if PYGAME_AVAILABLE:
+                    self.ensure_mixer()
                     try:
-                        pygame.mixer.music.load(str(audio_path))
-                        pygame.mixer.music.play()
+                        # Always use the same channel, so a new utterance cuts off
+                        # the previous one instead of talking over it
+                        channel = pygame.mixer.Channel(0)
+                        channel.play(_load_sound(str(audio_path)))
                         
-                        # If blocking, wait for playback to complete
+                        # If blocking, wait for playback to complete. The end event
+                        # would need a display, so poll at millisecond granularity
+                        # instead of sleeping up to 100 ms past the end
                         if blocking:
-                            while pygame.mixer.music.get_busy():
-                                time.sleep(0.1)
+                            while channel.get_busy():
+                                pygame.time.wait(PLAYBACK_POLL_MS)
                         
                         return True
                     except Exception as e:
-                        print(f"[VOICE] Error playing audio: {e}")
-                        # Fall back to text output
-                        print(f"[VOICE] Text: {text}")
+                        logger.warning("Error playing audio %s: %s", audio_path, e)
+                        logger.debug("Text: %s", text)
                         return False
                 else:
-                    # No pygame, just print the text
-                    print(f"[VOICE] Would play: {audio_path}")
-                    print(f"[VOICE] Text: {text}")
+                    # No pygame, nothing can be played
+                    logger.debug("Would play: %s (text: %s)", audio_path, text)
                     return True
             else:
-                print(f"[VOICE] Audio file not found: {audio_path}")
-                # Fall back to text output
-                print(f"[VOICE] Text: {text}")
+                logger.debug("Audio file not found: %s (text: %s)", audio_path, text)
                 return False
         
         # This will be implemented when we add live TTS support
-        print(f"[VOICE] Would speak: {text}")
+        logger.debug("Would speak: %s", text)
         return True
     
     def generate_audio_file(self, text: str, force: bool = False) -> Optional[Path]:
@@ -212,12 +385,11 @@ class VoiceEngine:
         audio_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Skip if the file already exists and we're not forcing regeneration
-        if not force and audio_path.exists():
+        if not force and self._audio_exists(audio_path):
             return audio_path
             
         # This will be implemented when we add TTS support
-        print(f"[VOICE] Would generate audio file: {audio_path}")
-        print(f"[VOICE] Text: {text}")
+        logger.debug("Would generate audio file: %s (text: %s)", audio_path, text)
         
         # For now, return None to indicate that generation is not implemented
         return None
@@ -233,9 +405,11 @@ class VoiceEngine:
         """
         if self.language != language:
             self.language = language
+            self._lang_dir = self.audio_dir / language
             if self.use_pregenerated:
                 self._load_available_files()
                 self.voice_mapping = self._load_voice_mapping()
+            self._path_cache = self._build_path_table()
         return True
     
     def enable(self) -> None:
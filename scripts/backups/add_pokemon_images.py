@@ -21,10 +21,12 @@ def add_image_urls(input_file, output_file):
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(pokemon_data, f, ensure_ascii=False, indent=2)
 
-def download_images(input_file, output_dir):
+def download_images(input_file, output_dir, max_workers=16):
     """Download Pokemon images locally."""
     import requests
+    from concurrent.futures import ThreadPoolExecutor
     from pathlib import Path
+    from requests.adapters import HTTPAdapter
     
     with open(input_file, 'r', encoding='utf-8') as f:
         pokemon_data = json.load(f)
@@ -32,18 +34,31 @@ def download_images(input_file, output_dir):
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    for pokemon in pokemon_data:
-        image_url = pokemon['image_url']
+    # One pooled session shared by all workers, so connections to the host are reused
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    def download(pokemon):
         local_path = Path(output_dir) / f"{pokemon['id']}.png"
-        
-        if not local_path.exists():
-            print(f"Downloading {pokemon['nom']}...")
-            response = requests.get(image_url)
-            if response.status_code == 200:
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-            else:
-                print(f"Failed to download {pokemon['nom']}")
+        if local_path.exists():
+            return
+        print(f"Downloading {pokemon['nom']}...")
+        try:
+            response = session.get(pokemon['image_url'], timeout=30)
+        except requests.RequestException as e:
+            print(f"Failed to download {pokemon['nom']}: {e}")
+            return
+        if response.status_code == 200:
+            with open(local_path, 'wb') as f:
+                f.write(response.content)
+        else:
+            print(f"Failed to download {pokemon['nom']}")
+    
+    # The downloads are network-bound, so run them concurrently
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(download, pokemon_data))
 
 if __name__ == '__main__':
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -1,25 +1,50 @@
 """Add size categories to the Pokemon dataset"""
 import json
+import os
+import textwrap
 from pathlib import Path
 from pokenator.main import get_height_category, get_weight_category
 
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+def iter_pokemon(f):
+    """Yield Pokemon records from a binary file, streaming when ijson is installed"""
+    if HAS_IJSON:
+        return ijson.items(f, 'item', use_float=True)
+    return iter(json.load(f))
+
+def write_pokemon(records, f):
+    """Write records as a JSON array one element at a time.
+
+    The output matches json.dump(list(records), f, indent=2, ensure_ascii=False).
+    """
+    first = True
+    for record in records:
+        f.write('[\n' if first else ',\n')
+        f.write(textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), '  '))
+        first = False
+    f.write('[]' if first else '\n]')
+
+def add_categories(pokemon):
+    pokemon['size_categories'] = {
+        'height': get_height_category(pokemon['taille']),
+        'weight': get_weight_category(pokemon['poids'])
+    }
+    return pokemon
+
 def main():
-    # Load the dataset
     data_path = Path(__file__).parent.parent / "data" / "pokemon_gen1_dataset_with_colors.json"
-    with open(data_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
-    
-    # Add categories to each Pokemon
-    for pokemon in dataset:
-        pokemon['size_categories'] = {
-            'height': get_height_category(pokemon['taille']),
-            'weight': get_weight_category(pokemon['poids'])
-        }
-    
-    # Save the updated dataset
-    with open(data_path, 'w', encoding='utf-8') as f:
-        json.dump(dataset, f, indent=2, ensure_ascii=False)
-    
+    tmp_path = data_path.with_name(data_path.name + '.tmp')
+
+    # Add categories to each Pokemon as it streams through, then swap the file in
+    with open(data_path, 'rb') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+        write_pokemon(map(add_categories, iter_pokemon(src)), dst)
+    os.replace(tmp_path, data_path)
+
     print("✅ Added size categories to dataset")
 
 if __name__ == "__main__":
@@ -9,11 +9,11 @@ def load_dataset() -> List[Dict[str, Any]]:
     with open('data/pokemon_gen1_dataset.json', 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_distribution(values: List[float], title: str, unit: str) -> tuple:
+def analyze_distribution(values: np.ndarray, title: str, unit: str) -> tuple:
     """Analyze the distribution of values and suggest brackets"""
     # Calculate quartiles and other statistics
     q1, median, q3 = np.percentile(values, [25, 50, 75])
-    min_val, max_val = min(values), max(values)
+    min_val, max_val = values.min(), values.max()
     
     # Print statistics
     print(f"\n{title} Distribution Analysis:")
@@ -51,12 +51,18 @@ def get_size_category(value: float, q1: float, q3: float) -> str:
     else:
         return "large"
 
+SIZE_CATEGORIES = np.array(["small", "medium", "large"])
+
+def get_size_categories(values: np.ndarray, q1: float, q3: float) -> np.ndarray:
+    """Vectorized get_size_category over a whole array of values"""
+    return SIZE_CATEGORIES[np.digitize(values, [q1, q3], right=True)]
+
 def main():
     dataset = load_dataset()
     
     # Extract heights and weights
-    heights = [pokemon['taille'] for pokemon in dataset]
-    weights = [pokemon['poids'] for pokemon in dataset]
+    heights = np.fromiter((pokemon['taille'] for pokemon in dataset), dtype=np.float64, count=len(dataset))
+    weights = np.fromiter((pokemon['poids'] for pokemon in dataset), dtype=np.float64, count=len(dataset))
     
     # Analyze height distribution
     height_q1, height_median, height_q3 = analyze_distribution(heights, "Height", "m")
@@ -82,16 +88,20 @@ def main():
         "Pikachu", "Ronflex", "Salamèche", "Dracolosse", "Métamorph"
     ]
     
+    # Categorize every Pokemon at once, then look examples up by name
+    height_cats = get_size_categories(heights, height_q1, height_q3)
+    weight_cats = get_size_categories(weights, weight_q1, weight_q3)
+    index_by_name = {pokemon['nom']: i for i, pokemon in enumerate(dataset)}
+    
     print("\nPokemon Size Classifications:")
     for name in example_pokemon:
-        for pokemon in dataset:
-            if pokemon['nom'] == name:
-                height_cat = get_size_category(pokemon['taille'], height_q1, height_q3)
-                weight_cat = get_size_category(pokemon['poids'], weight_q1, weight_q3)
-                print(f"\n{name}:")
-                print(f"Height: {pokemon['taille']}m ({height_cat})")
-                print(f"Weight: {pokemon['poids']}kg ({weight_cat})")
-                break
+        idx = index_by_name.get(name)
+        if idx is None:
+            continue
+        pokemon = dataset[idx]
+        print(f"\n{name}:")
+        print(f"Height: {pokemon['taille']}m ({height_cats[idx]})")
+        print(f"Weight: {pokemon['poids']}kg ({weight_cats[idx]})")
 
 if __name__ == "__main__":
     main()
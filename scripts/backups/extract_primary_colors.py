@@ -3,31 +3,18 @@ import os
 import json
 import time
 import argparse
+import functools
 from pathlib import Path
 from PIL import Image
 from dotenv import load_dotenv
 from google import genai
+from gemini_cache import MODEL, cache_path, read_cached_response, save_cached_response
 
 # Define valid colors as a constant
 VALID_COLORS = {'red', 'blue', 'green', 'yellow', 'brown', 'purple', 'pink', 'gray', 'white', 'black'}
 
-def get_primary_color(image_path):
-    """Get primary color from image using Gemini Flash 2.0"""
-    try:
-        # Load API key from .env
-        load_dotenv()
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in .env file")
-
-        # Load image
-        image = Image.open(image_path)
-        
-        # Initialize Gemini client
-        client = genai.Client(api_key=api_key)
-        
-        # Make request with a very specific prompt
-        prompt = f"""Analyze this Pokemon's primary color.
+# Very specific prompt; any change to it invalidates the cached responses
+PROMPT = f"""Analyze this Pokemon's primary color.
 Choose EXACTLY ONE color from this list: {', '.join(sorted(VALID_COLORS))}
 Rules:
 1. Pick the most dominant color in the Pokemon's body
@@ -35,20 +22,48 @@ Rules:
 3. Respond with just the color name in lowercase, nothing else
 4. You must choose one of the listed colors, no other colors are allowed"""
 
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[prompt, image]
+# Load API key from .env once
+load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Create the Gemini client once and reuse it for every request"""
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in .env file")
+    return genai.Client(api_key=api_key)
+
+def get_primary_color(image_path):
+    """Get primary color from image using Gemini Flash 2.0
+    
+    Returns a (color, cached) tuple; cached is True when the answer came from disk.
+    """
+    try:
+        cached_file = cache_path(Path(image_path).read_bytes(), PROMPT)
+        cached_color = read_cached_response(cached_file)
+        if cached_color is not None:
+            return cached_color, True
+
+        # Load image
+        image = Image.open(image_path)
+        
+        response = get_client().models.generate_content(
+            model=MODEL,
+            contents=[PROMPT, image]
         )
         
         # Get color from response
         color = response.text.lower().strip()
         
-        # Validate color
-        return color if color in VALID_COLORS else 'unknown'
+        # Validate color, only caching valid answers so bad ones are retried
+        if color not in VALID_COLORS:
+            return 'unknown', False
+        save_cached_response(cached_file, color)
+        return color, False
             
     except Exception as e:
         print(f"Error processing {image_path}: {str(e)}")
-        return 'unknown'
+        return 'unknown', False
 
 def load_dataset(data_path, colors_path):
     """Load the dataset, preferring the colors dataset if it exists"""
@@ -95,7 +110,7 @@ def process_pokemon(pokemon_id, assets_dir, dataset, output_path=None, delay=5):
         return False
     
     print(f"Processing {pokemon['nom']} (#{pokemon_id})...")
-    color = get_primary_color(image_path)
+    color, cached = get_primary_color(image_path)
     
     # Update only in visual_attributes
     if 'visual_attributes' not in pokemon:
@@ -108,8 +123,8 @@ def process_pokemon(pokemon_id, assets_dir, dataset, output_path=None, delay=5):
     if output_path:
         save_dataset(dataset, output_path)
     
-    # Wait before next request to avoid rate limiting
-    if delay > 0:
+    # Wait before next request to avoid rate limiting (cache hits made no request)
+    if delay > 0 and not cached:
         print(f"Waiting {delay} seconds before next request...")
         time.sleep(delay)
     
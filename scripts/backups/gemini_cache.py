@@ -0,0 +1,37 @@
+"""On-disk cache of Gemini responses shared by the image analysis scripts"""
+import contextlib
+import hashlib
+from pathlib import Path
+
+MODEL = "gemini-2.0-flash"
+
+# Responses are cached on disk so reruns don't hit the API again
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.gemini_cache'
+
+def cache_path(image_bytes, prompt):
+    """Cache file for a response, keyed by image content, model and prompt"""
+    key = hashlib.sha256(image_bytes + MODEL.encode() + prompt.encode()).hexdigest()
+    return CACHE_DIR / f"{key}.txt"
+
+def read_cached_response(cached_file):
+    """Return a cached response, or None if there isn't one"""
+    try:
+        return cached_file.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+def save_cached_response(cached_file, text):
+    """Cache a response, replacing the file atomically.
+
+    Only responses that parsed and validated should be cached, since a cached
+    response is replayed on every later run.
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    tmp_path = cached_file.with_suffix('.tmp')
+    try:
+        tmp_path.write_text(text, encoding='utf-8')
+        tmp_path.replace(cached_file)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+        raise
@@ -4,6 +4,7 @@ from pathlib import Path
 from google import genai
 import PIL.Image
 from dotenv import load_dotenv
+from gemini_cache import MODEL, cache_path, read_cached_response, save_cached_response
 
 # Predefined visual attributes
 VISUAL_ATTRIBUTES = {
@@ -24,11 +25,21 @@ def save_pokemon_data(data, file_path):
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+def parse_attributes(text):
+    """Parse a response into the attributes it names with a valid option"""
+    attributes = {}
+    for line in text.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            value = value.strip().lower()
+            if key in VISUAL_ATTRIBUTES and value in VISUAL_ATTRIBUTES[key]:
+                attributes[key] = value
+    return attributes
+
 def analyze_pokemon_image(client, image_path, pokemon_name):
     """Analyze Pokemon image using Gemini Vision API to extract specific visual attributes."""
     try:
-        image = PIL.Image.open(image_path)
-        
         # Craft a specific prompt for controlled attribute extraction
         attributes_list = "\n".join(
             f"- {attr.replace('_', ' ').title()}: {', '.join(options)}"
@@ -46,20 +57,23 @@ size_appearance: medium
 texture: smooth
 notable_features: wings"""
         
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=[prompt, image]
-        )
-        
-        # Parse response into structured attributes
-        attributes = {}
-        for line in response.text.strip().split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip().lower()
-                if key in VISUAL_ATTRIBUTES and value in VISUAL_ATTRIBUTES[key]:
-                    attributes[key] = value
+        # Reuse a previous response for the same image, model and prompt
+        cached_file = cache_path(Path(image_path).read_bytes(), prompt)
+        text = read_cached_response(cached_file)
+        if text is not None:
+            attributes = parse_attributes(text)
+        else:
+            image = PIL.Image.open(image_path)
+            response = client.models.generate_content(
+                model=MODEL,
+                contents=[prompt, image]
+            )
+            
+            # Parse response into structured attributes, only caching complete
+            # answers so that bad or truncated ones are retried
+            attributes = parse_attributes(response.text)
+            if len(attributes) == len(VISUAL_ATTRIBUTES):
+                save_cached_response(cached_file, response.text)
         
         # Ensure all attributes are present
         for attr in VISUAL_ATTRIBUTES:
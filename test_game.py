@@ -1,4 +1,7 @@
 """Test script for the Pokenator game"""
+import argparse
+import random
+import sys
 from pokenator.main import load_dataset, QuestionGenerator, get_height_category, get_weight_category, normalize_letter
 from collections import Counter
 
@@ -8,28 +11,50 @@ def analyze_question_split(generator, question_metadata):
         return None
     
     attribute, value = question_metadata
-    total = len(generator.current_pokemon_set)
-    matching = sum(1 for p in generator.current_pokemon_set if (
-        value in p['types'] if attribute == 'type'
-        else value == p.get('visual_primary_color') if attribute == 'visual_primary_color'
-        else value == p.get('height_category') if attribute == 'height_category'
-        else value == p.get('weight_category') if attribute == 'weight_category'
-        else False
-    ))
+    total = generator.get_remaining_count()
+    if not total:
+        return None
+    # The generator counts its remaining Pokémon from its columns, the same
+    # counts it ranked the question by, rather than re-testing every Pokémon
+    matching = generator.count_matching(attribute, value)
     split_ratio = matching / total
     return split_ratio
 
-def simulate_game(target_pokemon, verbose=False):
-    """Simulate a game with a target Pokemon and analyze each question's split"""
-    dataset = load_dataset()
+def get_target_answers(target):
+    """Questions the target Pokemon answers yes to, as (attribute, value) pairs
+    
+    Uses the attribute names and values of the questions from QuestionGenerator.
+    """
+    answers = {('type', type_) for type_ in target['types']}
+    answers.update((
+        ('primary_color', target['visual_primary_color']),
+        ('height_category', target['height_category']),
+        ('weight_category', target['weight_category']),
+        ('can_evolve', target['can_evolve']),
+    ))
+    return answers
+
+def simulate_game(target_pokemon, verbose=False, dataset=None):
+    """Simulate a game with a target Pokemon and analyze each question's split
+    
+    The dataset is loaded if not given, so callers simulating several games
+    can load it once and pass it to each of them.
+    """
+    if dataset is None:
+        dataset = load_dataset()
     generator = QuestionGenerator(dataset)
     
     # Find target Pokemon in dataset
     target = next(p for p in dataset if p['nom'] == target_pokemon)
     
+    # The target's answers don't change during the game, so work them out once
+    target_answers = get_target_answers(target)
+    
+    # Verbose output is collected and written in one go when the game ends
+    lines = []
     if verbose:
-        print(f"\n🎮 Testing with {target['nom']}:")
-        print("----------------------------------------")
+        lines.append(f"\n🎮 Testing with {target['nom']}:")
+        lines.append("----------------------------------------")
     
     question_count = 0
     max_questions = 20  # Safety limit
@@ -44,46 +69,44 @@ def simulate_game(target_pokemon, verbose=False):
         # If we have a guess, error, or too many questions, stop
         if metadata is None:
             if verbose:
-                print(f"❌ Error: {question}")
+                lines.append(f"❌ Error: {question}")
             break
         elif metadata[0] == 'final_guess':
             success = metadata[1] == target['nom']
             if verbose:
-                print(f"{'✅' if success else '❌'} Final guess: {metadata[1]}")
+                lines.append(f"{'✅' if success else '❌'} Final guess: {metadata[1]}")
             break
         elif question_count > max_questions:
             if verbose:
-                print("❌ Too many questions")
+                lines.append("❌ Too many questions")
             break
         
         # Count question types
         attribute, value = metadata
         question_types[attribute] += 1
         
-        # Analyze the split
-        split_ratio = analyze_question_split(generator, metadata)
-        remaining = len(generator.current_pokemon_set)
+        # Analyze the split, which is only reported in verbose mode
+        if verbose:
+            split_ratio = analyze_question_split(generator, metadata)
+            remaining = generator.get_remaining_count()
         
         # Get the correct answer for this Pokemon
-        answer = (
-            value in target['types'] if attribute == 'type'
-            else value == target.get('visual_primary_color') if attribute == 'visual_primary_color'
-            else value == target.get('height_category') if attribute == 'height_category'
-            else value == target.get('weight_category') if attribute == 'weight_category'
-            else False
-        )
+        answer = metadata in target_answers
         
         # Update generator with the answer
         generator.update_pokemon_set(attribute, value, answer)
         
         # Print the question and split analysis if verbose
         if verbose:
-            print(f"Q{question_count}: {question}")
-            print(f"A: {'oui' if answer else 'non'}")
+            lines.append(f"Q{question_count}: {question}")
+            lines.append(f"A: {'oui' if answer else 'non'}")
             if split_ratio is not None:
-                print(f"Split: {split_ratio:.1%} yes, {(1-split_ratio):.1%} no")
-            print(f"Remaining: {remaining} -> {len(generator.current_pokemon_set)}")
-            print("----------------------------------------")
+                lines.append(f"Split: {split_ratio:.1%} yes, {(1-split_ratio):.1%} no")
+            lines.append(f"Remaining: {remaining} -> {generator.get_remaining_count()}")
+            lines.append("----------------------------------------")
+    
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     return {
         'pokemon': target_pokemon,
@@ -96,11 +119,11 @@ def simulate_game(target_pokemon, verbose=False):
 def run_sample_test(sample_size=10):
     """Run tests with a sample of Pokémon and analyze results"""
     dataset = load_dataset()
-    import random
     
-    # Use a fixed seed for reproducible testing
-    random.seed(42)
-    sample = random.sample(dataset, min(sample_size, len(dataset)))
+    # Use a fixed seed for reproducible testing, on a private generator so the
+    # global random state is left alone
+    rng = random.Random(42)
+    sample = rng.sample(dataset, min(sample_size, len(dataset)))
     
     print(f"🔍 Testing {len(sample)} randomly selected Pokémon...")
     
@@ -109,12 +132,11 @@ def run_sample_test(sample_size=10):
     
     for pokemon in sample:
         print(f"\nTesting {pokemon['nom']}...")
-        result = simulate_game(pokemon['nom'], verbose=True)
+        result = simulate_game(pokemon['nom'], verbose=True, dataset=dataset)
         results.append(result)
         
         # Update question type counts
-        for q_type, count in result.get('question_types', {}).items():
-            all_questions[q_type] += count
+        all_questions.update(result.get('question_types', {}))
     
     # Calculate statistics
     successes = sum(1 for r in results if r['success'])
@@ -128,24 +150,28 @@ def run_sample_test(sample_size=10):
     print(f"Average questions needed: {avg_questions:.1f}")
     
     print("\n📋 Question type distribution:")
-    total_questions = sum(all_questions.values())
+    total_questions = all_questions.total()
     for q_type, count in all_questions.most_common():
         percentage = count / total_questions * 100
         print(f"- {q_type}: {count} ({percentage:.1f}%)")
 
 def main():
     """Run tests with selected Pokemon and analyze results"""
-    import sys
+    parser = argparse.ArgumentParser(description="Simulate Pokenator games and analyze the questions asked")
+    parser.add_argument("pokemon", nargs="?",
+                        help="Pokemon to test with, or 'sample' to test a random sample")
+    parser.add_argument("count", nargs="?", type=int, default=5,
+                        help="Number of Pokemon in the random sample (default: 5)")
+    args = parser.parse_args()
     
     # Check if we're running a sample test
-    if len(sys.argv) > 1 and sys.argv[1] == 'sample':
-        sample_size = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-        run_sample_test(sample_size)
+    if args.pokemon == 'sample':
+        run_sample_test(args.count)
         return
         
     # Otherwise, run a specific test with a single Pokemon
-    if len(sys.argv) > 1:
-        pokemon_name = sys.argv[1]
+    if args.pokemon:
+        pokemon_name = args.pokemon
         print(f"🔍 Testing specifically with {pokemon_name}...")
         simulate_game(pokemon_name, verbose=True)
         return
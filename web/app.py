@@ -1,21 +1,62 @@
 """Flask web application to display Pokemon in a grid"""
-from flask import Flask, render_template
+from flask import Flask, render_template, request
 from pathlib import Path
-import json
+import functools
+import hashlib
+import sys
+
+# Add the project root to the Python path if needed
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from pokenator.jsonio import parse_json
 
 app = Flask(__name__)
 
+DATA_PATH = Path(__file__).parent.parent / 'data' / 'pokemon_gen1_dataset_with_colors.json'
+TEMPLATE_PATH = Path(__file__).parent / 'templates' / 'index.html'
+
+@functools.lru_cache(maxsize=1)
+def _read_pokemon_data(data_path, mtime_ns, size):
+    """Parse and sort the dataset once per version of the file"""
+    pokemon_data = parse_json(data_path.read_bytes())
+    return sorted(pokemon_data, key=lambda x: x['id'])
+
 def load_pokemon_data():
-    """Load Pokemon dataset with attributes"""
-    data_path = Path(__file__).parent.parent / 'data' / 'pokemon_gen1_dataset_with_colors.json'
-    with open(data_path, 'r', encoding='utf-8') as f:
-        return sorted(json.load(f), key=lambda x: x['id'])
+    """Load Pokemon dataset with attributes
+
+    The file is only read again when it changes; the returned list is shared
+    between requests and must not be modified.
+    """
+    stat = DATA_PATH.stat()
+    return _read_pokemon_data(DATA_PATH, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=1)
+def _render_index(mtime_ns, size, template_mtime_ns):
+    """Render the grid once per version of the dataset and template
+
+    Returns:
+        Tuple of (UTF-8 encoded page, ETag of the page)
+    """
+    pokemon_data = _read_pokemon_data(DATA_PATH, mtime_ns, size)
+    body = render_template('index.html', pokemon_data=pokemon_data).encode('utf-8')
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+# Load the dataset at startup rather than on the first request
+load_pokemon_data()
 
 @app.route('/')
 def index():
     """Display Pokemon grid"""
-    pokemon_data = load_pokemon_data()
-    return render_template('index.html', pokemon_data=pokemon_data)
+    data_stat = DATA_PATH.stat()
+    body, etag = _render_index(data_stat.st_mtime_ns, data_stat.st_size,
+                               TEMPLATE_PATH.stat().st_mtime_ns)
+    response = app.response_class(body, mimetype='text/html')
+    # Browsers revalidate on each visit and get an empty 304 while the page is unchanged
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 if __name__ == '__main__':
     app.run(debug=True, port=5002)